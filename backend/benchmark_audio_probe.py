@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from services.audio_probe import get_audio_duration
+
+RUNS = 20
+
+
+def ffprobe_duration(path: str):
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def bench(fn, path: str):
+    start = time.perf_counter()
+    value = None
+    for _ in range(RUNS):
+        value = fn(path)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / RUNS
+    return value, elapsed_ms
+
+
+def main(paths: list[str]):
+    print(f"{'file':<40} {'probe (s)':>10} {'probe ms':>9} {'ffprobe (s)':>12} {'ffprobe ms':>11}")
+    for path in paths:
+        probe_value, probe_ms = bench(get_audio_duration, path)
+        try:
+            ff_value, ff_ms = bench(ffprobe_duration, path)
+        except FileNotFoundError:
+            ff_value, ff_ms = None, float("nan")
+
+        probe_str = f"{probe_value:.3f}" if probe_value is not None else "n/a"
+        ff_str = f"{ff_value:.3f}" if ff_value is not None else "n/a"
+        print(f"{os.path.basename(path):<40} {probe_str:>10} {probe_ms:>9.2f} {ff_str:>12} {ff_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or ["debug_audio.mp3"])
@@ -0,0 +1,116 @@
+"""
+Benchmark the image provider chain against mock_providers.py.
+
+Starts the mock server in-process, points every provider request at it
+(IMAGE_API_OVERRIDE) and runs the same batch of concurrent generate_image
+calls under several strategies: sequential fallback, hedge width 2/3 and
+staggered hedging. Reports time-to-image, throughput and placeholder count.
+
+    python benchmark_image_chain.py --images 8 --time-scale 0.1
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+from core.config import settings
+from mock_providers import create_app, start_in_thread
+from services import generator_image, job_poller, rate_limit
+from services.provider_health import ProviderScoreboard
+
+# (label, IMAGE_HEDGE_WIDTH, IMAGE_HEDGE_STAGGER in unscaled seconds)
+STRATEGIES = [
+    ("sequential", 1, 0.0),
+    ("hedge-2", 2, 0.0),
+    ("hedge-3", 3, 0.0),
+    ("hedge-3-stagger", 3, 3.0),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def run_strategy(n_images: int, out_dir: str, time_scale: float):
+    placeholders = []
+    original_placeholder = generator_image.create_placeholder_image
+
+    def counting_placeholder(prompt, output_path, *args, **kwargs):
+        placeholders.append(output_path)
+        return original_placeholder(prompt, output_path, *args, **kwargs)
+
+    generator_image.create_placeholder_image = counting_placeholder
+    try:
+        async def timed(i: int) -> float:
+            started = time.monotonic()
+            await generator_image.generate_image(
+                f"benchmark scene {i}: a lighthouse at dusk",
+                os.path.join(out_dir, f"scene_{i}.jpg"),
+            )
+            return time.monotonic() - started
+
+        started = time.monotonic()
+        latencies = await asyncio.gather(*(timed(i) for i in range(n_images)))
+        wall = time.monotonic() - started
+    finally:
+        generator_image.create_placeholder_image = original_placeholder
+
+    # Report in unscaled ("real provider") seconds
+    latencies = [t / time_scale for t in latencies]
+    return latencies, wall / time_scale, len(placeholders)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Image provider chain benchmark")
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--time-scale", type=float, default=0.1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    scale = args.time_scale
+
+    # Quotas are emulated by the mock (429s); don't let local buckets hide them
+    settings.IMAGE_RATE_LIMITS = {name: 100000 for name in rate_limit.DEFAULT_RATE_LIMITS}
+    generator_image.image_cache.max_bytes = 0
+    job_poller.POLL_BASE_INTERVAL *= scale
+    job_poller.POLL_MAX_INTERVAL *= scale
+
+    out_dir = tempfile.mkdtemp(prefix="reel_chain_bench_")
+    rows = []
+    for offset, (label, width, stagger) in enumerate(STRATEGIES):
+        # Fresh server (model warm-up timers), scoreboard and quotas per strategy
+        port = args.port + offset
+        server = start_in_thread(create_app(time_scale=scale), port)
+        settings.IMAGE_API_OVERRIDE = f"http://127.0.0.1:{port}"
+        generator_image.scoreboard = ProviderScoreboard(
+            failure_threshold=settings.IMAGE_BREAKER_THRESHOLD,
+            cooldown_seconds=settings.IMAGE_BREAKER_COOLDOWN * scale,
+        )
+        rate_limit._buckets.clear()
+        generator_image._hedge_launches.clear()
+        settings.IMAGE_HEDGE_WIDTH = width
+        settings.IMAGE_HEDGE_STAGGER = stagger * scale
+
+        latencies, wall, placeholders = asyncio.run(run_strategy(args.images, out_dir, scale))
+        rows.append((label, latencies, wall, placeholders))
+
+        server.should_exit = True
+
+    print(f"\n{args.images} concurrent images, time scale {scale} (times shown unscaled)")
+    print(f"{'strategy':<18} {'mean s':>8} {'p50 s':>8} {'p95 s':>8} {'img/min':>8} {'placeholders':>13}")
+    for label, latencies, wall, placeholders in rows:
+        print(
+            f"{label:<18} {statistics.mean(latencies):>8.1f} {percentile(latencies, 50):>8.1f} "
+            f"{percentile(latencies, 95):>8.1f} {len(latencies) / wall * 60:>8.1f} {placeholders:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+import numpy as np
+from PIL import Image
+
+from services.image_postprocess import finalize_image
+
+RUNS = 5
+
+# (label, width, height, source format) - typical provider outputs
+SAMPLES = [
+    ("SD 1.5 square", 1024, 1024, "JPEG"),
+    ("FLUX portrait", 1536, 2752, "JPEG"),
+    ("Stable Horde", 512, 768, "PNG"),
+    ("Exact size PNG", 1080, 1920, "PNG"),
+]
+
+
+def make_sample(width: int, height: int, fmt: str) -> bytes:
+    """Smooth gradient plus noise - compresses roughly like a real render."""
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 / width, y * 255 / height, (x + y) * 127 / (width + height)], axis=-1)
+    noise = np.random.default_rng(0).normal(0, 12, base.shape)
+    pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+    buf = BytesIO()
+    Image.fromarray(pixels).save(buf, fmt, quality=95)
+    return buf.getvalue()
+
+
+def legacy_pipeline(content: bytes, output_path: str):
+    """What each generate_image_* function used to do."""
+    img = Image.open(BytesIO(content))
+    if img.size != (1080, 1920):
+        img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
+    img.save(output_path, quality=95)
+
+
+def bench(fn, content: bytes, output_path: str):
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn(content, output_path)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / RUNS
+    return elapsed_ms, os.path.getsize(output_path)
+
+
+def main():
+    out_dir = tempfile.mkdtemp(prefix="reel_img_bench_")
+    print(f"{'source':<18} {'legacy ms':>10} {'legacy KB':>10} {'new ms':>8} {'new KB':>8}")
+    for label, width, height, fmt in SAMPLES:
+        content = make_sample(width, height, fmt)
+        legacy_ms, legacy_bytes = bench(legacy_pipeline, content, os.path.join(out_dir, "legacy.png"))
+        new_ms, new_bytes = bench(finalize_image, content, os.path.join(out_dir, "scene.jpg"))
+        print(f"{label:<18} {legacy_ms:>10.1f} {legacy_bytes / 1024:>10.0f} {new_ms:>8.1f} {new_bytes / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
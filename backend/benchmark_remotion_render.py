@@ -0,0 +1,134 @@
+"""
+Benchmark Remotion render settings: frames/sec per tier and concurrency.
+
+Renders one synthetic typographic reel (sine-wave narration, N scenes) once
+per cell of the matrix {tier preset} x {browser tabs}, single chunk, and
+reports wall time and frames/sec, plus what `auto` would pick on this
+machine. Needs the frontend's node_modules (npm install in ../frontend).
+
+    python benchmark_remotion_render.py --seconds 10 --template Bauhaus --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import wave
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+import numpy as np
+
+from core.config import settings
+from services.ffmpeg_assembler import available_cpus
+from services.remotion_renderer import RENDER_FPS, RENDER_TIERS, RemotionRenderer, plan_render_settings
+from services.remotion_server import close_render_servers
+from services.render_cache import render_cache
+
+
+def make_narration(path: str, seconds: float):
+    rate = 22050
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(samples.tobytes())
+
+
+def make_scenes(n_scenes: int, total_frames: int) -> list[dict]:
+    frames = [total_frames // n_scenes] * n_scenes
+    frames[-1] += total_frames - sum(frames)
+    return [
+        {
+            "narration": f"Scene {i} says something worth reading on screen",
+            "visual_prompt": f"Scene {i}",
+            "visual_text": f"SCENE {i}",
+            "estimated_duration": f / RENDER_FPS,
+            "duration_frames": f,
+        }
+        for i, f in enumerate(frames)
+    ]
+
+
+def concurrency_levels() -> list[int]:
+    cpus = available_cpus()
+    return sorted({1, max(1, cpus // 2), cpus})
+
+
+async def run_matrix(args) -> list[dict]:
+    renderer = RemotionRenderer(frontend_dir=args.frontend)
+    total_frames = int(args.seconds * RENDER_FPS)
+
+    # Whole-reel renders only - chunking is measured by REMOTION_CHUNK_WORKERS
+    settings.REMOTION_CHUNK_WORKERS = 1
+    settings.REMOTION_RENDER_SERVER = not args.npx
+    # Every cell renders the same props - the render cache would answer all but the first
+    render_cache.max_bytes = 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        audio_path = os.path.join(tmp, "narration.wav")
+        make_narration(audio_path, args.seconds)
+        scenes = make_scenes(args.scenes, total_frames)
+
+        # Warm-up: bundle + browser launch aren't what's being measured
+        settings.REMOTION_RENDER_TIER, settings.REMOTION_CONCURRENCY = "small", 1
+        await renderer.render_video(
+            args.template, os.path.join(tmp, "warmup.mp4"), audio_path, "warmup",
+            min(total_frames, 60), scenes,
+        )
+
+        for tier in RENDER_TIERS:
+            for concurrency in concurrency_levels():
+                settings.REMOTION_RENDER_TIER, settings.REMOTION_CONCURRENCY = tier, concurrency
+                output = os.path.join(tmp, f"{tier}_{concurrency}.mp4")
+                start = time.perf_counter()
+                result = await renderer.render_video(
+                    args.template, output, audio_path, "benchmark", total_frames, scenes
+                )
+                elapsed = time.perf_counter() - start
+                row = {"tier": tier, "concurrency": concurrency, "seconds": round(elapsed, 2)}
+                if isinstance(result, dict):
+                    row["error"] = result["error"][:200]
+                else:
+                    row["fps"] = round(total_frames / elapsed, 1)
+                    row["size_mb"] = round(os.path.getsize(output) / (1024 * 1024), 2)
+                results.append(row)
+
+    await close_render_servers()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remotion render settings benchmark")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--scenes", type=int, default=4)
+    parser.add_argument("--template", default="Bauhaus")
+    parser.add_argument("--frontend", default="../frontend")
+    parser.add_argument("--npx", action="store_true", help="Render with the npx CLI instead of the sidecar")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_matrix(args))
+
+    auto = plan_render_settings()
+    print(f"\nCPUs: {available_cpus()}, auto picks: {auto}")
+    print(f"{'tier':<8} {'tabs':>5} {'seconds':>9} {'fps':>7} {'MB':>7}")
+    for row in results:
+        if "error" in row:
+            print(f"{row['tier']:<8} {row['concurrency']:>5} {row['seconds']:>9.2f}  ERROR {row['error']}")
+        else:
+            print(f"{row['tier']:<8} {row['concurrency']:>5} {row['seconds']:>9.2f} {row['fps']:>7.1f} {row['size_mb']:>7.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"cpus": available_cpus(), "auto": auto, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark standard-flow video assembly: moviepy vs the ffmpeg engine.
+
+Builds synthetic scenes (1080x1920 JPEG + WAV narration), then assembles the
+reel once per engine (ffmpeg both serial and with parallel segment encoding)
+in a child process while sampling the RSS of that process and its ffmpeg
+children. Reports wall time, peak RSS and output size.
+
+    python benchmark_video_assembly.py --scenes 6 --seconds 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+# Add backend to path
+sys.path.append(os.getcwd())
+
+import numpy as np
+import psutil
+from PIL import Image
+
+# (label, environment overrides)
+ENGINES = [
+    ("moviepy", {"VIDEO_ENGINE": "moviepy"}),
+    ("ffmpeg-1", {"VIDEO_ENGINE": "ffmpeg", "VIDEO_ENCODE_WORKERS": "1", "VIDEO_MOTION": "false"}),
+    ("ffmpeg", {"VIDEO_ENGINE": "ffmpeg", "VIDEO_ENCODE_WORKERS": "0", "VIDEO_MOTION": "false"}),
+    ("ffmpeg-kb", {"VIDEO_ENGINE": "ffmpeg", "VIDEO_ENCODE_WORKERS": "0", "VIDEO_MOTION": "true"}),
+]
+
+
+def make_scene_assets(out_dir: str, n_scenes: int, seconds: float) -> list[dict]:
+    rng = np.random.default_rng(0)
+    scenes = []
+    for i in range(n_scenes):
+        image_path = os.path.join(out_dir, f"scene_{i}.jpg")
+        y, x = np.mgrid[0:1920, 0:1080]
+        pixels = np.stack([x * 255 / 1080, y * 255 / 1920, np.full_like(x, 40 * i % 255)], axis=-1)
+        pixels = np.clip(pixels + rng.normal(0, 10, pixels.shape), 0, 255).astype(np.uint8)
+        Image.fromarray(pixels).save(image_path, "JPEG", quality=92)
+
+        audio_path = os.path.join(out_dir, f"audio_{i}.wav")
+        rate = 22050
+        t = np.arange(int(rate * (seconds - 0.5 + 0.1 * i))) / rate
+        samples = (np.sin(2 * np.pi * (220 + 20 * i) * t) * 8000).astype(np.int16)
+        with wave.open(audio_path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(samples.tobytes())
+
+        scenes.append({
+            "narration": f"Scene {i}",
+            "visual_prompt": f"Scene {i}",
+            "image_path": image_path,
+            "audio_path": audio_path,
+        })
+    return scenes
+
+
+def run_engine(overrides: dict, scenes_json: str, output_path: str) -> tuple[float, float, bool]:
+    """Assemble in a child process; return (wall seconds, peak RSS MB of the process tree, success)."""
+    env = dict(os.environ, **overrides)
+    child_code = (
+        "import json, sys; sys.path.append('.');"
+        "from models import Scene; from services.video_editor import assemble_reel;"
+        f"scenes = [Scene(**s) for s in json.load(open({scenes_json!r}))];"
+        f"sys.exit(0 if assemble_reel(scenes, {output_path!r}) else 1)"
+    )
+
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", child_code],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    parent = psutil.Process(proc.pid)
+    peak = 0
+    while proc.poll() is None:
+        try:
+            tree = [parent, *parent.children(recursive=True)]
+            peak = max(peak, sum(p.memory_info().rss for p in tree if p.is_running()))
+        except psutil.Error:
+            pass
+        time.sleep(0.02)
+    wall = time.perf_counter() - started
+    return wall, peak / (1024 * 1024), proc.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Video assembly benchmark")
+    parser.add_argument("--scenes", type=int, default=6)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp(prefix="reel_assembly_bench_")
+    scenes = make_scene_assets(out_dir, args.scenes, args.seconds)
+    scenes_json = os.path.join(out_dir, "scenes.json")
+    with open(scenes_json, "w") as f:
+        json.dump(scenes, f)
+
+    print(f"{args.scenes} scenes x ~{args.seconds:.0f}s, {os.cpu_count()} CPUs")
+    print(f"{'engine':<10} {'wall s':>8} {'peak RSS MB':>12} {'output MB':>10}")
+    for engine, overrides in ENGINES:
+        # One dir per engine: segments/ next to the output is reused across runs
+        engine_dir = os.path.join(out_dir, engine)
+        os.makedirs(engine_dir)
+        output_path = os.path.join(engine_dir, "final.mp4")
+        wall, peak_mb, ok = run_engine(overrides, scenes_json, output_path)
+        size_mb = os.path.getsize(output_path) / (1024 * 1024) if ok else 0
+        print(f"{engine:<10} {wall:>8.1f} {peak_mb:>12.0f} {size_mb:>10.1f}" + ("" if ok else "  FAILED"))
+
+
+if __name__ == "__main__":
+    main()
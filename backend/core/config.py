@@ -22,7 +22,50 @@ class Settings(BaseSettings):
     GETIMG_API_KEY: str = ""
     SEGMIND_API_KEY: str = ""
     DEEPAI_API_KEY: str = ""
+
+    # Scene image output (format follows the file extension: .jpg / .webp / .png)
+    IMAGE_QUALITY: int = 92
+
+    # Image provider circuit breakers
+    IMAGE_BREAKER_THRESHOLD: int = 3     # Consecutive failures before a provider is skipped
+    IMAGE_BREAKER_COOLDOWN: int = 300    # Seconds to skip it (doubles on each re-trip)
+
+    # Hedged image generation: race the top-N providers, keep the first image
+    IMAGE_HEDGE_WIDTH: int = 1           # Providers raced per image (1 = sequential chain)
+    IMAGE_HEDGE_STAGGER: float = 0.0     # Seconds between hedged launches (0 = all at once)
+    # Max hedged launches per paid provider per window, e.g. {"replicate": 20}; unlisted = never hedged
+    IMAGE_HEDGE_PAID_CAPS: dict[str, int] = {}
+    IMAGE_HEDGE_PAID_WINDOW: int = 3600  # Seconds the paid hedge caps apply to (sliding window)
+    # Requests/minute per image provider, e.g. {"prodia": 30}; see services/rate_limit.py for defaults
+    IMAGE_RATE_LIMITS: dict[str, float] = {}
+
+    # Route every image provider request to this base URL (mock_providers.py for offline benchmarks)
+    IMAGE_API_OVERRIDE: str = ""
+
+    # Persistent image cache (DATA_DIR/image_cache)
+    IMAGE_CACHE_MAX_MB: int = 500                  # LRU-evicted above this size (0 disables the cache)
+    IMAGE_CACHE_NEAR_DUP_THRESHOLD: float = 0.0    # Token-set similarity for near-duplicate hits (0 = exact only)
     
+    # Audio
+    # Synthesize all scene narrations in one Piper pass (split per scene afterwards); gTTS stays per scene
+    BATCH_TTS: bool = True
+
+    # Video assembly (standard flow): "ffmpeg" (still-image segments + stream-copy concat) or "moviepy"
+    VIDEO_ENGINE: str = "ffmpeg"
+    VIDEO_ENCODE_WORKERS: int = 0        # Scene segments encoded in parallel (0 = one per CPU)
+    VIDEO_MOTION: bool = True            # Ken Burns pan/zoom on scene stills (ffmpeg engine only)
+    VIDEO_TMPFS: bool = True             # Put assembly scratch files on /dev/shm when memory allows
+    VIDEO_TMPFS_MIN_MB: int = 256        # Free space a workspace needs before tmpfs is chosen
+    VIDEO_PREVIEW: bool = True           # Publish a fast low-res preview (both flows) while the full render runs
+    VIDEO_PIPELINE: bool = True          # Encode each scene's segment as soon as its image + audio exist (ffmpeg engine)
+
+    # Typographic (Remotion) rendering
+    REMOTION_RENDER_SERVER: bool = True  # Render on a warm Node sidecar (frontend/render-server.mjs); npx fallback
+    REMOTION_CHUNK_WORKERS: int = 0      # Parallel frame-range chunks per render (0 = from free CPU/memory, 1 = off)
+    REMOTION_RENDER_TIER: str = "auto"   # Capture/x264 preset: small | medium | large (auto = from CPU/memory)
+    REMOTION_CONCURRENCY: int = 0        # Browser tabs per render (0 = free CPUs split between chunks)
+    RENDER_CACHE_MAX_MB: int = 2000      # Finished renders reused for identical props (DATA_DIR/render_cache, 0 disables)
+
     # Instagram (Optional for local dev)
     IG_ACCESS_TOKEN: str = ""
     IG_ACCOUNT_ID: str = ""
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI, BackgroundTasks, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
@@ -7,7 +7,9 @@ import os
 import sys
 import asyncio
 from datetime import datetime, timedelta
+import json
 import shutil
+import time
 import traceback
 
 # Windows subprocess fix
@@ -83,13 +85,15 @@ from models import (
     TaskStatus,
     Job,
     Scene,
+    SceneEdit,
     DurationMode,
 )
 
 from services.generator_script import generate_script
-from services.generator_image import generate_image
-from services.generator_audio import generate_audio
-from services.video_editor import assemble_reel
+from services.generator_image import generate_images
+from services.generator_audio import generate_audio, generate_audio_batch
+from services.video_editor import assemble_reel, assemble_preview, segment_dir_for
+from services.ffmpeg_assembler import SegmentPrefetcher, available_cpus, get_ffmpeg_binary
 from services.duration_utils import (
     calculate_scene_durations,
     get_scene_frames,
@@ -99,6 +103,7 @@ from services.duration_utils import (
 from core.config import settings
 
 FPS = 30
+PREVIEW_CONCURRENT_MIN_CPUS = 2  # Typographic preview runs beside the full render only above this
 
 app = FastAPI(title="ReelAgent API", version="1.0.0")
 
@@ -179,161 +184,79 @@ async def process_job(job_id: str):
     # TYPOGRAPHIC / REMOTION FLOW
     # ==================================================
     if job.image_style.startswith("Typographic"):
-        JobDB.update(job_id, status=TaskStatus.VISUALIZING)
-        JobDB.add_log(job_id, f"Typographic mode: {job.image_style}")
-        JobDB.add_log(job_id, f"Duration mode: {job.duration_mode.value}")
-
-        # ------------------------------------------------
-        # Combine narration
-        # ------------------------------------------------
-        full_script = " ".join(scene.narration for scene in scenes)
-
-        # ------------------------------------------------
-        # Generate AUDIO (RETURNS DURATION)
-        # ------------------------------------------------
-        audio_path = os.path.join(job_dir, "full_audio.mp3")
-
-        try:
-            audio_path, audio_duration = await generate_audio(
-                full_script,
-                audio_path,
-            )
-        except Exception as e:
-            JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=str(e))
-            return
-
-        JobDB.add_log(
-            job_id,
-            f"Audio generated: {audio_duration:.2f}s",
-        )
-
-        # ------------------------------------------------
-        # Calculate per-scene durations (SCRIPT FIRST)
-        # ------------------------------------------------
-        JobDB.update(job_id, status=TaskStatus.EDITING)
-        JobDB.add_log(job_id, "Calculating scene durations...")
-
-        # ------------------------------------------------
-        # Calculate per-scene durations
-        # ------------------------------------------------
-        # First estimate durations based on narration word count
-        estimated_durations = [estimate_duration_from_text(s.narration) for s in scenes]
-        total_estimated = sum(estimated_durations)
-        if total_estimated > 0:
-            # Scale estimated durations to match actual audio length EXACTLY
-            scale_factor = audio_duration / total_estimated
-            scene_durations = [d * scale_factor for d in estimated_durations]
-        else:
-            # Fallback if estimates fail
-            scene_durations = [audio_duration / len(scenes)] * len(scenes)
-
-        # Convert to frame counts, ensuring total matches audio
-        scene_frames = get_scene_frames(scene_durations, fps=FPS)
-        total_frames = int(audio_duration * FPS)
-        
-        # Adjust last scene to fix rounding errors
-        current_frames = sum(scene_frames)
-        diff = total_frames - current_frames
-        if scene_frames:
-            scene_frames[-1] += diff
-
-        total_seconds = total_frames / FPS
-        JobDB.add_log(job_id, f"Final video duration (synced to audio): {total_seconds:.2f}s ({total_frames} frames)")
-        
-        # Log per-scene durations
-        for i, frames in enumerate(scene_frames):
-             JobDB.add_log(job_id, f"Scene {i+1}: {frames} frames")
-
-        # ------------------------------------------------
-        # Prepare scenes payload for Remotion
-        # ------------------------------------------------
-        scenes_payload = []
-        for i, scene in enumerate(scenes):
-            data = scene.dict()
-            data["duration_frames"] = scene_frames[i]
-            scenes_payload.append(data)
-
-        # ------------------------------------------------
-        # Render with Remotion
-        # ------------------------------------------------
-        from services.remotion_renderer import RemotionRenderer
-
-        template_id = job.image_style.split(":")[-1].strip()
-        output_video = os.path.join(job_dir, "final_typographic.mp4")
-
-        JobDB.add_log(job_id, f"Starting Remotion render (template: {template_id})...")
-        
-        renderer = RemotionRenderer(frontend_dir="../frontend")
-
-        try:
-            result = await renderer.render_video(
-                template_id=template_id,
-                output_path=output_video,
-                audio_path=audio_path,
-                text=full_script,
-                duration_in_frames=total_frames,
-                scenes=scenes_payload,
-            )
-        except Exception as e:
-            error_msg = f"Remotion render crashed: {type(e).__name__}: {str(e)}"
-            JobDB.add_log(job_id, f"ERROR: {error_msg}")
-            JobDB.add_log(job_id, f"TRACEBACK: {traceback.format_exc()[-500:]}")
-            JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=error_msg)
-            return
-
-        # Handle the new error return format
-        if result is None:
-            error_msg = "Remotion returned None (unknown failure)"
-            JobDB.add_log(job_id, f"ERROR: {error_msg}")
-            JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=error_msg)
-            return
-            
-        if isinstance(result, dict) and "error" in result:
-            error_msg = result["error"]
-            # Truncate for storage but log full
-            JobDB.add_log(job_id, f"ERROR: Remotion failed: {error_msg[:500]}")
-            JobDB.update(
-                job_id,
-                status=TaskStatus.FAILED,
-                error_msg=error_msg[:200],  # Truncate for DB
-            )
-            return
-
-        # Success!
-        JobDB.update(
-            job_id,
-            status=TaskStatus.FINISHED,
-            video_path=result,
-        )
-        JobDB.add_log(job_id, "✓ Typographic video ready")
+        await run_typographic_flow(job_id, job, scenes, job_dir)
         return
 
     # ==================================================
     # STANDARD IMAGE + VIDEO FLOW
     # ==================================================
     JobDB.update(job_id, status=TaskStatus.VISUALIZING)
+    output_video = os.path.join(job_dir, "final.mp4")
 
-    semaphore = asyncio.Semaphore(1)
-
-    async def process_scene(i: int, scene: Scene):
-        async def gen_img():
-            img_path = os.path.join(job_dir, f"scene_{i}.png")
-            prompt = f"{scene.visual_prompt}, {job.image_style}, high quality"
-            async with semaphore:
-                await asyncio.to_thread(generate_image, prompt, img_path)
+    # Scene-level pipelining: a scene's segment is encoded as soon as its
+    # image and narration exist, while slower providers are still working
+    prefetch = None
+    if settings.VIDEO_PIPELINE and settings.VIDEO_ENGINE == "ffmpeg" and get_ffmpeg_binary():
+        prefetch = SegmentPrefetcher(segment_dir_for(output_video), len(scenes), job_id)
+
+    def scene_ready(i: int):
+        if prefetch:
+            prefetch.scene_ready(i, scenes[i])
+
+    # No global semaphore: image requests are throttled per provider by the
+    # shared token buckets in services.rate_limit, so scenes run in parallel
+    async def gen_images():
+        # One call for the whole job so repeated prompts share batched requests
+        img_paths = [os.path.join(job_dir, f"scene_{i}.jpg") for i in range(len(scenes))]
+        prompts = [f"{s.visual_prompt}, {job.image_style}, high quality" for s in scenes]
+
+        def on_image(i: int):
+            scenes[i].image_path = img_paths[i]
+            scene_ready(i)
+
+        results = await generate_images(prompts, img_paths, style=job.image_style, on_ready=on_image)
+        for scene, img_path in zip(scenes, results):
             scene.image_path = img_path
 
-        async def gen_audio_scene():
-            audio_path = os.path.join(job_dir, f"scene_{i}.mp3")
-            audio_path, _ = await generate_audio(scene.narration, audio_path)
-            scene.audio_path = audio_path
+    async def gen_audio_scene(i: int, scene: Scene):
+        audio_path = os.path.join(job_dir, f"scene_{i}.mp3")
+        audio_path, _ = await generate_audio(scene.narration, audio_path)
+        scene.audio_path = audio_path
+        scene_ready(i)
 
-        await asyncio.gather(gen_img(), gen_audio_scene())
-        return scene
+    async def gen_audio_all():
+        if not settings.BATCH_TTS:
+            await asyncio.gather(*(gen_audio_scene(i, s) for i, s in enumerate(scenes)))
+            return
 
-    updated_scenes = await asyncio.gather(
-        *(process_scene(i, s) for i, s in enumerate(scenes))
-    )
+        # One TTS pass for every scene, split back into per-scene files
+        JobDB.add_log(job_id, "Generating narration in a single TTS pass...")
+        audio_paths = [os.path.join(job_dir, f"scene_{i}.mp3") for i in range(len(scenes))]
+        results = await generate_audio_batch(
+            [s.narration for s in scenes],
+            audio_paths,
+        )
+        for i, (scene, (audio_path, _)) in enumerate(zip(scenes, results)):
+            scene.audio_path = audio_path
+            scene_ready(i)
+
+    generators = [asyncio.ensure_future(gen_images()), asyncio.ensure_future(gen_audio_all())]
+    generated = False
+    try:
+        await asyncio.gather(*generators)
+        generated = True
+    except Exception as e:
+        JobDB.add_log(job_id, f"ERROR: Asset generation crashed: {e}")
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=str(e))
+        return
+    finally:
+        if not generated:
+            # Stop the other generator and the early encoder threads too
+            for task in generators:
+                task.cancel()
+            if prefetch:
+                prefetch.shutdown()
+    updated_scenes = scenes
 
     JobDB.update(job_id, script=updated_scenes)
 
@@ -341,7 +264,18 @@ async def process_job(job_id: str):
     # Assemble final video
     # ------------------------------------------------
     JobDB.update(job_id, status=TaskStatus.EDITING)
-    output_video = os.path.join(job_dir, "final.mp4")
+
+    # Low-res preview first (seconds), then the full-quality assembly -
+    # unless pipelining already encoded every segment and only the concat is left
+    if settings.VIDEO_PREVIEW and (prefetch is None or prefetch.pending):
+        preview_video = os.path.join(job_dir, "preview.mp4")
+        if await asyncio.to_thread(assemble_preview, updated_scenes, preview_video, job_id):
+            JobDB.update(job_id, video_path=preview_video, preview_path=preview_video)
+            JobDB.add_log(job_id, "✓ Preview ready - assembling full quality...")
+
+    # Early segments are picked up by segment_key; only missing ones get encoded
+    if prefetch:
+        await prefetch.wait()
 
     success = await asyncio.to_thread(
         assemble_reel,
@@ -365,6 +299,305 @@ async def process_job(job_id: str):
         )
 
 
+async def run_typographic_flow(job_id: str, job: Job, scenes: list[Scene], job_dir: str):
+    """Typographic / Remotion flow: one narration track, rendered over the script's scenes."""
+    JobDB.update(job_id, status=TaskStatus.VISUALIZING)
+    JobDB.add_log(job_id, f"Typographic mode: {job.image_style}")
+    JobDB.add_log(job_id, f"Duration mode: {job.duration_mode.value}")
+
+    # ------------------------------------------------
+    # Combine narration
+    # ------------------------------------------------
+    full_script = " ".join(scene.narration for scene in scenes)
+
+    # ------------------------------------------------
+    # Generate AUDIO (RETURNS DURATION)
+    # ------------------------------------------------
+    audio_path = os.path.join(job_dir, "full_audio.mp3")
+
+    try:
+        audio_path, audio_duration = await generate_audio(
+            full_script,
+            audio_path,
+        )
+    except Exception as e:
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=str(e))
+        return
+
+    JobDB.add_log(
+        job_id,
+        f"Audio generated: {audio_duration:.2f}s",
+    )
+
+    # ------------------------------------------------
+    # Calculate per-scene durations (SCRIPT FIRST)
+    # ------------------------------------------------
+    JobDB.update(job_id, status=TaskStatus.EDITING)
+    JobDB.add_log(job_id, "Calculating scene durations...")
+
+    # ------------------------------------------------
+    # Calculate per-scene durations
+    # ------------------------------------------------
+    # First estimate durations based on narration word count
+    estimated_durations = [estimate_duration_from_text(s.narration) for s in scenes]
+    total_estimated = sum(estimated_durations)
+    if total_estimated > 0:
+        # Scale estimated durations to match actual audio length EXACTLY
+        scale_factor = audio_duration / total_estimated
+        scene_durations = [d * scale_factor for d in estimated_durations]
+    else:
+        # Fallback if estimates fail
+        scene_durations = [audio_duration / len(scenes)] * len(scenes)
+
+    # Convert to frame counts, ensuring total matches audio
+    scene_frames = get_scene_frames(scene_durations, fps=FPS)
+    total_frames = int(audio_duration * FPS)
+
+    # Adjust last scene to fix rounding errors
+    current_frames = sum(scene_frames)
+    diff = total_frames - current_frames
+    if scene_frames:
+        scene_frames[-1] += diff
+
+    total_seconds = total_frames / FPS
+    JobDB.add_log(job_id, f"Final video duration (synced to audio): {total_seconds:.2f}s ({total_frames} frames)")
+
+    # Log per-scene durations
+    for i, frames in enumerate(scene_frames):
+         JobDB.add_log(job_id, f"Scene {i+1}: {frames} frames")
+
+    # ------------------------------------------------
+    # Prepare scenes payload for Remotion
+    # ------------------------------------------------
+    scenes_payload = []
+    for i, scene in enumerate(scenes):
+        data = scene.dict()
+        data["duration_frames"] = scene_frames[i]
+        scenes_payload.append(data)
+
+    # ------------------------------------------------
+    # Render with Remotion
+    # ------------------------------------------------
+    from services.remotion_renderer import RemotionRenderer
+
+    template_id = job.image_style.split(":")[-1].strip()
+    output_video = os.path.join(job_dir, "final_typographic.mp4")
+
+    JobDB.add_log(job_id, f"Starting Remotion render (template: {template_id})...")
+
+    renderer = RemotionRenderer(frontend_dir="../frontend")
+
+    # Low-res preview: alongside the full render (shown only if it's ready
+    # first) when there are CPUs to spare, otherwise before it - on a small
+    # machine the two would just split the same cores
+    preview_task = None
+    if settings.VIDEO_PREVIEW:
+        preview = render_typographic_preview(
+            job_id, renderer, template_id, os.path.join(job_dir, "preview_typographic.mp4"),
+            audio_path, full_script, total_frames, scenes_payload,
+        )
+        if available_cpus() > PREVIEW_CONCURRENT_MIN_CPUS:
+            preview_task = asyncio.create_task(preview)
+        else:
+            await preview
+
+    try:
+        result = await renderer.render_video(
+            template_id=template_id,
+            output_path=output_video,
+            audio_path=audio_path,
+            text=full_script,
+            duration_in_frames=total_frames,
+            scenes=scenes_payload,
+            job_id=job_id,
+        )
+    except Exception as e:
+        error_msg = f"Remotion render crashed: {type(e).__name__}: {str(e)}"
+        JobDB.add_log(job_id, f"ERROR: {error_msg}")
+        JobDB.add_log(job_id, f"TRACEBACK: {traceback.format_exc()[-500:]}")
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=error_msg)
+        return
+    finally:
+        if preview_task and not preview_task.done():
+            preview_task.cancel()
+
+    # Handle the new error return format
+    if result is None:
+        error_msg = "Remotion returned None (unknown failure)"
+        JobDB.add_log(job_id, f"ERROR: {error_msg}")
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=error_msg)
+        return
+
+    if isinstance(result, dict) and "error" in result:
+        error_msg = result["error"]
+        # Truncate for storage but log full
+        JobDB.add_log(job_id, f"ERROR: Remotion failed: {error_msg[:500]}")
+        JobDB.update(
+            job_id,
+            status=TaskStatus.FAILED,
+            error_msg=error_msg[:200],  # Truncate for DB
+        )
+        return
+
+    # Success!
+    JobDB.update(
+        job_id,
+        status=TaskStatus.FINISHED,
+        video_path=result,
+    )
+    JobDB.add_log(job_id, "✓ Typographic video ready")
+
+
+async def render_typographic_preview(
+    job_id: str,
+    renderer,
+    template_id: str,
+    preview_video: str,
+    audio_path: str,
+    full_script: str,
+    total_frames: int,
+    scenes_payload: list[dict],
+):
+    """Third-size render run next to the full one; publishes itself unless cancelled first."""
+    JobDB.add_log(job_id, "Rendering preview...")
+    started = time.perf_counter()
+    try:
+        preview = await renderer.render_video(
+            template_id=template_id,
+            output_path=preview_video,
+            audio_path=audio_path,
+            text=full_script,
+            duration_in_frames=total_frames,
+            scenes=scenes_payload,
+            job_id=job_id,
+            preview=True,
+        )
+    except Exception as e:
+        preview = {"error": f"{type(e).__name__}: {e}"}
+    if isinstance(preview, dict):
+        JobDB.add_log(job_id, f"Preview skipped: {preview.get('error', '')[:200]}")
+    else:
+        JobDB.update(job_id, video_path=preview, preview_path=preview)
+        JobDB.add_log(job_id, f"✓ Preview ready in {time.perf_counter() - started:.1f}s - rendering full quality...")
+
+
+async def process_scene_edit(job_id: str, index: int, edit: SceneEdit):
+    """
+    Apply an edit to one scene of a finished job and rebuild the reel
+    incrementally: only that scene's audio/image is regenerated, and only its
+    segment (standard flow) or frame range (typographic flow) is re-rendered.
+    """
+    job = JobDB.get(job_id)
+    if not job:
+        return
+
+    scenes = [scene.model_copy() for scene in job.script]
+    scene = scenes[index]
+    changes = edit.model_dump(exclude_none=True)
+    narration_changed = changes.get("narration", scene.narration) != scene.narration
+    prompt_changed = changes.get("visual_prompt", scene.visual_prompt) != scene.visual_prompt
+    for field, value in changes.items():
+        setattr(scene, field, value)
+
+    job_dir = os.path.dirname(job.video_path)
+    try:
+        if job.image_style.startswith("Typographic"):
+            await edit_typographic_scene(job_id, job, scenes, index, job_dir, narration_changed)
+        else:
+            await edit_standard_scene(job_id, job, scenes, index, job_dir, narration_changed, prompt_changed)
+    except Exception as e:
+        error_msg = f"Scene edit crashed: {type(e).__name__}: {str(e)}"
+        JobDB.add_log(job_id, f"ERROR: {error_msg}")
+        JobDB.add_log(job_id, f"TRACEBACK: {traceback.format_exc()[-500:]}")
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=error_msg)
+
+
+async def edit_standard_scene(
+    job_id: str,
+    job: Job,
+    scenes: list[Scene],
+    index: int,
+    job_dir: str,
+    narration_changed: bool,
+    prompt_changed: bool,
+):
+    scene = scenes[index]
+    JobDB.update(job_id, status=TaskStatus.VISUALIZING)
+
+    if narration_changed or not scene.audio_path:
+        JobDB.add_log(job_id, f"Scene {index + 1}: regenerating narration...")
+        audio_path = os.path.join(job_dir, f"scene_{index}.mp3")
+        scene.audio_path, _ = await generate_audio(scene.narration, audio_path)
+
+    if prompt_changed or not scene.image_path:
+        JobDB.add_log(job_id, f"Scene {index + 1}: regenerating image...")
+        img_path = os.path.join(job_dir, f"scene_{index}.jpg")
+        prompt = f"{scene.visual_prompt}, {job.image_style}, high quality"
+        results = await generate_images([prompt], [img_path], style=job.image_style)
+        scene.image_path = results[0]
+
+    JobDB.update(job_id, script=scenes, status=TaskStatus.EDITING)
+
+    # Segments of the other scenes are reused (video_editor.segment_dir_for)
+    output_video = os.path.join(job_dir, "final.mp4")
+    success = await asyncio.to_thread(assemble_reel, scenes, output_video, job_id)
+
+    if success:
+        JobDB.update(job_id, status=TaskStatus.FINISHED, video_path=output_video)
+        JobDB.add_log(job_id, f"✓ Scene {index + 1} updated")
+    else:
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg="Video assembly failed")
+
+
+async def edit_typographic_scene(
+    job_id: str,
+    job: Job,
+    scenes: list[Scene],
+    index: int,
+    job_dir: str,
+    narration_changed: bool,
+):
+    props_path = os.path.join(job_dir, "remotion_props.json")
+    if narration_changed or not os.path.exists(props_path):
+        # New narration re-times every later scene: full render, script kept
+        JobDB.add_log(job_id, f"Scene {index + 1}: narration changed, re-rendering the reel...")
+        await run_typographic_flow(job_id, job, scenes, job_dir)
+        return
+
+    # Same narration, same timeline - only this scene's frames change
+    with open(props_path, "r", encoding="utf-8") as f:
+        props = json.load(f)
+    scene = scenes[index]
+    props["scenes"][index].update(visual_text=scene.visual_text, visual_prompt=scene.visual_prompt)
+    first = sum(s["duration_frames"] for s in props["scenes"][:index])
+    last = first + props["scenes"][index]["duration_frames"] - 1
+
+    from services.remotion_renderer import RemotionRenderer
+
+    JobDB.update(job_id, script=scenes, status=TaskStatus.EDITING)
+    JobDB.add_log(job_id, f"Scene {index + 1}: re-rendering frames {first}-{last}...")
+
+    template_id = job.image_style.split(":")[-1].strip()
+    output_video = os.path.join(job_dir, "final_typographic.mp4")
+    renderer = RemotionRenderer(frontend_dir="../frontend")
+    result = await renderer.rerender_range(
+        template_id,
+        output_video,
+        os.path.join(job_dir, "full_audio.mp3"),
+        props,
+        (first, last),
+        job_id=job_id,
+    )
+
+    if isinstance(result, dict):
+        JobDB.add_log(job_id, f"ERROR: Scene re-render failed: {result['error'][:500]}")
+        JobDB.update(job_id, status=TaskStatus.FAILED, error_msg=result["error"][:200])
+        return
+
+    JobDB.update(job_id, status=TaskStatus.FINISHED, video_path=result)
+    JobDB.add_log(job_id, f"✓ Scene {index + 1} updated")
+
+
 # ======================================================
 # API ROUTES
 # ======================================================
@@ -375,6 +608,23 @@ async def create_job(job_req: JobCreate, background_tasks: BackgroundTasks):
     return job
 
 
+@app.patch("/jobs/{job_id}/scenes/{index}", response_model=Job)
+async def edit_scene(job_id: str, index: int, edit: SceneEdit, background_tasks: BackgroundTasks):
+    job = JobDB.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in (TaskStatus.FINISHED, TaskStatus.FAILED) or not job.video_path:
+        raise HTTPException(status_code=409, detail="Only a finished reel can be edited")
+    if not job.script or not 0 <= index < len(job.script):
+        raise HTTPException(status_code=400, detail="Scene index out of range")
+
+    # The old preview no longer matches the reel being rebuilt
+    JobDB.update(job_id, status=TaskStatus.EDITING, error_msg=None, progress=None, preview_path=None)
+    JobDB.add_log(job_id, f"Editing scene {index + 1}...")
+    background_tasks.add_task(process_scene_edit, job_id, index, edit)
+    return JobDB.get(job_id)
+
+
 @app.get("/jobs", response_model=list[Job])
 def get_jobs():
     return list(JobDB.jobs.values())
@@ -411,6 +661,26 @@ async def startup_event():
     os.makedirs(settings.GENERATED_DIR, exist_ok=True)
     print("ReelAgent Startup: Ready")
     asyncio.create_task(cleanup_old_jobs())
+    asyncio.create_task(warm_render_server())
+
+
+async def warm_render_server():
+    """Build the Remotion bundle and start the sidecar in the background so the first render is warm too."""
+    from services.remotion_bundle import get_bundle_manager
+    from services.remotion_server import RenderServerError, get_render_server
+    serve_url = await get_bundle_manager("../frontend").get_bundle()
+    if not settings.REMOTION_RENDER_SERVER:
+        return
+    try:
+        await get_render_server("../frontend").start(serve_url)
+    except RenderServerError as e:
+        print(f"Remotion render server not started ({e}); renders will use npx")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from services.remotion_server import close_render_servers
+    await close_render_servers()
 
 
 # ======================================================
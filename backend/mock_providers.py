@@ -0,0 +1,243 @@
+"""
+Local stand-in for the image provider APIs used by services/generator_image.py.
+
+Emulates the HuggingFace router, Prodia, Stable Horde, DezGo, Craiyon and
+Pollinations, including their failure modes: 503 "model loading", 429 rate
+limits, slow responses, flaky 500s and JSON bodies where an image was
+expected. Point the backend at it with IMAGE_API_OVERRIDE:
+
+    python mock_providers.py --port 8765
+    IMAGE_API_OVERRIDE=http://127.0.0.1:8765 python main.py
+
+benchmark_image_chain.py starts it in-process.
+"""
+import argparse
+import asyncio
+import base64
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass
+from io import BytesIO
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from PIL import Image
+
+
+@dataclass
+class Behaviour:
+    latency: float = 1.0            # Seconds before answering
+    jitter: float = 0.3             # +/- fraction applied to latency
+    error_rate: float = 0.0         # Chance of an HTTP 500
+    rate_limit: float = 0.0         # Max accepted requests/second, 429 above (0 = unlimited)
+    loading_for: float = 0.0        # HF only: answer 503 "loading" for the first N seconds
+    json_instead_of_image: bool = False
+    queue_time: float = 0.0         # Job-based providers: seconds until the job is done
+
+
+# Default scenario: one provider/model per failure mode
+DEFAULT_SCENARIO = {
+    "hf:runwayml/stable-diffusion-v1-5": Behaviour(latency=1.5, loading_for=30),
+    "hf:stabilityai/stable-diffusion-2-1": Behaviour(latency=0.5, json_instead_of_image=True),
+    "hf:prompthero/openjourney": Behaviour(latency=8),
+    "hf:black-forest-labs/FLUX.1-schnell": Behaviour(latency=2, error_rate=0.5),
+    "prodia": Behaviour(latency=0.3, queue_time=6),
+    "stablehorde": Behaviour(latency=0.3, queue_time=10),
+    "dezgo": Behaviour(latency=4, rate_limit=0.5),
+    "craiyon": Behaviour(latency=12),
+    "pollinations": Behaviour(latency=3),
+}
+
+
+def _sample_jpeg(width: int = 768, height: int = 1344) -> bytes:
+    img = Image.new("RGB", (width, height), (90, 60, 140))
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+def create_app(scenario: dict = None, time_scale: float = 1.0, seed: int = 0) -> FastAPI:
+    """Build the mock app. All scenario times are multiplied by time_scale."""
+    scenario = scenario or DEFAULT_SCENARIO
+    rng = random.Random(seed)
+    image_bytes = _sample_jpeg()
+    started_at = time.monotonic()
+    last_accepted: dict[str, float] = {}
+    jobs: dict[str, dict] = {}
+    job_ids = itertools.count(1)
+    stats: dict[str, dict[int, int]] = {}
+
+    app = FastAPI(title="ReelAgent mock providers")
+    app.state.stats = stats
+
+    def count(key: str, status: int):
+        stats.setdefault(key, {})
+        stats[key][status] = stats[key].get(status, 0) + 1
+
+    async def gate(key: str) -> Response | None:
+        """Apply latency / rate limit / random errors; return an error response or None."""
+        behaviour = scenario[key]
+        now = time.monotonic()
+
+        if behaviour.rate_limit > 0:
+            min_gap = time_scale / behaviour.rate_limit
+            if now - last_accepted.get(key, -1e9) < min_gap:
+                count(key, 429)
+                return JSONResponse({"error": "Too many requests"}, status_code=429)
+            last_accepted[key] = now
+
+        delay = behaviour.latency * (1 + rng.uniform(-behaviour.jitter, behaviour.jitter))
+        await asyncio.sleep(max(0.0, delay) * time_scale)
+
+        if rng.random() < behaviour.error_rate:
+            count(key, 500)
+            return JSONResponse({"error": "Internal error"}, status_code=500)
+        return None
+
+    def image_url(request: Request, name: str) -> str:
+        return str(request.base_url) + f"mock-images/{name}.jpg"
+
+    def new_job(key: str, n: int = 1) -> str:
+        job_id = f"{key}-{next(job_ids)}"
+        jobs[job_id] = {
+            "ready_at": time.monotonic() + scenario[key].queue_time * time_scale,
+            "n": n,
+        }
+        return job_id
+
+    # ----------------------------
+    # Shared image download
+    # ----------------------------
+    @app.get("/mock-images/{name}")
+    async def mock_image(name: str):
+        return Response(image_bytes, media_type="image/jpeg")
+
+    # ----------------------------
+    # HuggingFace router
+    # ----------------------------
+    @app.post("/router.huggingface.co/models/{model:path}")
+    async def huggingface(model: str):
+        key = f"hf:{model}"
+        if key not in scenario:
+            return JSONResponse({"error": f"Model {model} not found"}, status_code=404)
+
+        behaviour = scenario[key]
+        elapsed = time.monotonic() - started_at
+        if elapsed < behaviour.loading_for * time_scale:
+            count(key, 503)
+            remaining = behaviour.loading_for * time_scale - elapsed
+            return JSONResponse(
+                {"error": f"Model {model} is currently loading", "estimated_time": remaining},
+                status_code=503,
+            )
+
+        error = await gate(key)
+        if error:
+            return error
+        count(key, 200)
+        if behaviour.json_instead_of_image:
+            return JSONResponse({"error": "Inference returned JSON"}, status_code=200)
+        return Response(image_bytes, media_type="image/jpeg")
+
+    # ----------------------------
+    # Prodia (submit + poll)
+    # ----------------------------
+    @app.post("/api.prodia.com/v1/job")
+    async def prodia_submit():
+        error = await gate("prodia")
+        if error:
+            return error
+        count("prodia", 200)
+        return {"job": new_job("prodia"), "status": "queued"}
+
+    @app.get("/api.prodia.com/v1/job/{job_id}")
+    async def prodia_status(job_id: str, request: Request):
+        job = jobs.get(job_id)
+        if not job:
+            return JSONResponse({"error": "Unknown job"}, status_code=404)
+        if time.monotonic() < job["ready_at"]:
+            return {"job": job_id, "status": "generating"}
+        return {"job": job_id, "status": "succeeded", "imageUrl": image_url(request, job_id)}
+
+    # ----------------------------
+    # Stable Horde (submit + check + status)
+    # ----------------------------
+    @app.post("/stablehorde.net/api/v2/generate/async")
+    async def horde_submit(request: Request):
+        error = await gate("stablehorde")
+        if error:
+            return error
+        body = await request.json()
+        n = int(body.get("params", {}).get("n", 1))
+        count("stablehorde", 202)
+        return JSONResponse({"id": new_job("stablehorde", n)}, status_code=202)
+
+    @app.get("/stablehorde.net/api/v2/generate/check/{job_id}")
+    async def horde_check(job_id: str):
+        job = jobs.get(job_id)
+        if not job:
+            return JSONResponse({"message": "Unknown job"}, status_code=404)
+        remaining = max(0.0, job["ready_at"] - time.monotonic())
+        return {"done": remaining == 0, "faulted": False, "wait_time": round(remaining)}
+
+    @app.get("/stablehorde.net/api/v2/generate/status/{job_id}")
+    async def horde_status(job_id: str, request: Request):
+        job = jobs.get(job_id)
+        if not job:
+            return JSONResponse({"message": "Unknown job"}, status_code=404)
+        return {
+            "done": True,
+            "generations": [
+                {"img": image_url(request, f"{job_id}-{i}")} for i in range(job["n"])
+            ],
+        }
+
+    # ----------------------------
+    # DezGo / Craiyon / Pollinations (single request)
+    # ----------------------------
+    @app.post("/api.dezgo.com/text2image")
+    async def dezgo():
+        error = await gate("dezgo")
+        if error:
+            return error
+        count("dezgo", 200)
+        return Response(image_bytes, media_type="image/jpeg")
+
+    @app.post("/api.craiyon.com/v3")
+    async def craiyon():
+        error = await gate("craiyon")
+        if error:
+            return error
+        count("craiyon", 200)
+        return {"images": [base64.b64encode(image_bytes).decode("ascii")]}
+
+    @app.get("/image.pollinations.ai/prompt/{prompt:path}")
+    async def pollinations(prompt: str):
+        error = await gate("pollinations")
+        if error:
+            return error
+        count("pollinations", 200)
+        return Response(image_bytes, media_type="image/jpeg")
+
+    return app
+
+
+def start_in_thread(app: FastAPI, port: int) -> uvicorn.Server:
+    """Run the mock server on a daemon thread; returns once it accepts requests."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock image provider server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(time_scale=args.time_scale), host="127.0.0.1", port=args.port)
@@ -31,6 +31,12 @@ class Scene(BaseModel):
     image_path: Optional[str] = None
     audio_path: Optional[str] = None
 
+class SceneEdit(BaseModel):
+    """Changes to one scene of a finished job; omitted fields stay as they are"""
+    narration: Optional[str] = None
+    visual_prompt: Optional[str] = None
+    visual_text: Optional[str] = None
+
 class JobCreate(BaseModel):
     topic: str
     tone: str = "Futuristic, Curious"
@@ -50,8 +56,10 @@ class Job(BaseModel):
     
     script: Optional[List[Scene]] = None
     caption: Optional[str] = None
-    video_path: Optional[str] = None
+    video_path: Optional[str] = None  # The preview until the full render replaces it
+    preview_path: Optional[str] = None
     error_msg: Optional[str] = None
+    progress: Optional[float] = None  # Render progress 0-1 (typographic flow)
     logs: List[str] = []
 
 class JobDB:
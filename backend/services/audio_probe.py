@@ -0,0 +1,266 @@
+# Audio Probe for ReelAgent
+# Reads exact audio durations straight from container/frame headers.
+#
+# No decoding and no ffprobe subprocess: WAV duration comes from the RIFF
+# fmt/data chunks, MP3 duration from walking the MPEG frame headers and
+# summing samples per frame. The format is sniffed from the file content,
+# not the extension (Piper writes WAV data into "*.mp3" paths). The encoder
+# delay and padding recorded in a LAME tag are subtracted, as decoders do.
+
+import os
+import struct
+from typing import Optional
+
+# Bitrate tables (kbps) indexed by [version_key][layer][bitrate_index]
+# version_key: 1 = MPEG-1, 2 = MPEG-2 / MPEG-2.5 (they share tables)
+_BITRATES = {
+    1: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    2: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates indexed by raw version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000],
+}
+
+# How far we scan for the first frame sync / resync after junk (bytes)
+MAX_SYNC_SCAN = 64 * 1024
+
+
+def _parse_mp3_header(header: bytes) -> Optional[tuple[int, int, int, int, int]]:
+    """
+    Parse a 4-byte MPEG audio frame header.
+
+    Returns:
+        (frame_length_bytes, samples_per_frame, sample_rate, version_bits, channel_mode)
+        or None if the bytes are not a valid header.
+    """
+    if len(header) < 4:
+        return None
+
+    b0, b1, b2, b3 = header[0], header[1], header[2], header[3]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+    channel_mode = (b3 >> 6) & 0x03
+
+    if version_bits == 1 or layer_bits == 0:
+        return None  # reserved values
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None  # free-format / invalid
+
+    layer = 4 - layer_bits  # 3 -> Layer I, 2 -> Layer II, 1 -> Layer III
+    version_key = 1 if version_bits == 3 else 2
+
+    bitrate = _BITRATES[version_key][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or version_key == 1:
+        samples = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576  # MPEG-2/2.5 Layer III
+        frame_length = 72 * bitrate // sample_rate + padding
+
+    if frame_length < 4:
+        return None
+
+    return frame_length, samples, sample_rate, version_bits, channel_mode
+
+
+# Encoders writing the LAME extension after a Xing/Info header (ffmpeg's
+# libmp3lame tags itself "Lavc"/"Lavf" with the same layout)
+_LAME_ENCODERS = (b"LAME", b"Lavc", b"Lavf", b"L3.9")
+
+
+def _xing_offset(data: bytes, offset: int, version_bits: int, channel_mode: int) -> int:
+    """Offset of the Xing/Info tag in the frame at offset, or -1."""
+    mono = channel_mode == 3
+    if version_bits == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+
+    tag_offset = offset + 4 + side_info
+    return tag_offset if data[tag_offset:tag_offset + 4] in (b"Xing", b"Info") else -1
+
+
+def _is_info_frame(data: bytes, offset: int, version_bits: int, channel_mode: int) -> bool:
+    """True if the frame at offset carries a Xing/Info/VBRI tag instead of audio."""
+    if _xing_offset(data, offset, version_bits, channel_mode) != -1:
+        return True
+    return data[offset + 36: offset + 40] == b"VBRI"
+
+
+def _lame_gapless_samples(data: bytes, xing_offset: int) -> int:
+    """
+    Encoder delay + end padding (samples) from the LAME extension of a
+    Xing/Info tag; 0 if there is none. Decoders trim both, so they are not
+    part of the audible duration.
+    """
+    (flags,) = struct.unpack(">I", data[xing_offset + 4:xing_offset + 8])
+    lame = xing_offset + 8
+    lame += 4 if flags & 0x1 else 0    # frame count
+    lame += 4 if flags & 0x2 else 0    # byte count
+    lame += 100 if flags & 0x4 else 0  # seek TOC
+    lame += 4 if flags & 0x8 else 0    # quality
+
+    if data[lame:lame + 4] not in _LAME_ENCODERS:
+        return 0
+    # 9-byte version, revision/VBR method, lowpass, peak (4), radio +
+    # audiophile gain (2 + 2), flags, bitrate - then 12-bit delay + 12-bit padding
+    gapless = data[lame + 21:lame + 24]
+    if len(gapless) < 3:
+        return 0
+    delay = (gapless[0] << 4) | (gapless[1] >> 4)
+    padding = ((gapless[1] & 0x0F) << 8) | gapless[2]
+    return delay + padding
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Return the offset just past a leading ID3v2 tag (0 if none)."""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (
+            (data[6] & 0x7F) << 21
+            | (data[7] & 0x7F) << 14
+            | (data[8] & 0x7F) << 7
+            | (data[9] & 0x7F)
+        )
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _find_sync(data: bytes, offset: int) -> int:
+    """
+    Find the next offset holding a valid header whose successor is also valid
+    (or is end-of-file). Requiring two consecutive headers rejects the false
+    syncs that random 0xFF bytes in tag/junk data would otherwise produce.
+    """
+    end = min(len(data) - 4, offset + MAX_SYNC_SCAN)
+    pos = data.find(b"\xff", offset, end + 1)
+    while pos != -1 and pos <= end:
+        parsed = _parse_mp3_header(data[pos:pos + 4])
+        if parsed:
+            nxt = pos + parsed[0]
+            if nxt >= len(data) - 4 or _parse_mp3_header(data[nxt:nxt + 4]):
+                return pos
+        pos = data.find(b"\xff", pos + 1, end + 1)
+    return -1
+
+
+def get_mp3_duration(data: bytes) -> Optional[float]:
+    """
+    Exact MP3 duration by walking every frame header.
+
+    Works for CBR and VBR files and for concatenated streams (gTTS joins
+    several MP3 responses back to back), since each frame is counted
+    individually rather than trusting a single leading Xing header. The
+    delay/padding of each stream's LAME tag is subtracted from its rate.
+    """
+    offset = _find_sync(data, _skip_id3v2(data))
+    if offset == -1:
+        return None
+
+    samples_by_rate: dict[int, int] = {}
+    size = len(data)
+
+    while offset <= size - 4:
+        parsed = _parse_mp3_header(data[offset:offset + 4])
+        if not parsed:
+            # Junk between streams (e.g. an embedded ID3 tag) - try to resync
+            if data[offset:offset + 3] == b"TAG":
+                break  # ID3v1 trailer
+            offset = _find_sync(data, offset + (_skip_id3v2(data[offset:offset + 10]) or 1))
+            if offset == -1:
+                break
+            continue
+
+        frame_length, samples, sample_rate, version_bits, channel_mode = parsed
+        if offset + frame_length > size:
+            break  # Truncated final frame carries no complete audio
+
+        xing_offset = _xing_offset(data, offset, version_bits, channel_mode)
+        if xing_offset != -1:
+            trimmed = _lame_gapless_samples(data, xing_offset)
+            samples_by_rate[sample_rate] = samples_by_rate.get(sample_rate, 0) - trimmed
+        elif not _is_info_frame(data, offset, version_bits, channel_mode):
+            samples_by_rate[sample_rate] = samples_by_rate.get(sample_rate, 0) + samples
+        offset += frame_length
+
+    # Sum integer sample counts per rate to avoid float drift over long files
+    total_seconds = sum(n / rate for rate, n in samples_by_rate.items())
+    if total_seconds <= 0:
+        return None
+    return total_seconds
+
+
+def get_wav_duration(data: bytes) -> Optional[float]:
+    """Exact WAV duration from the RIFF fmt and data chunk sizes."""
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+
+    offset = 12
+    byte_rate = None
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        (chunk_size,) = struct.unpack("<I", data[offset + 4:offset + 8])
+
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            _, channels, sample_rate, byte_rate, block_align, bits = struct.unpack(
+                "<HHIIHH", data[offset + 8:offset + 24]
+            )
+            if not byte_rate:
+                byte_rate = sample_rate * channels * bits // 8
+
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streaming writers may leave the size unset - clamp to file size
+            available = len(data) - (offset + 8)
+            if chunk_size == 0 or chunk_size > available:
+                chunk_size = available
+            return chunk_size / byte_rate
+
+        offset += 8 + chunk_size + (chunk_size & 1)  # chunks are word-aligned
+
+    return None
+
+
+def get_audio_duration(path: str) -> Optional[float]:
+    """
+    Get the exact duration (seconds) of a WAV or MP3 file from its headers.
+
+    Returns None if the file is missing or the format is not recognised,
+    so callers can fall back to their own estimate.
+    """
+    try:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Audio probe failed to read {path}: {e}")
+        return None
+
+    if data[:4] == b"RIFF":
+        return get_wav_duration(data)
+    return get_mp3_duration(data)
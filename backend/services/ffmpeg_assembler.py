@@ -0,0 +1,358 @@
+# FFmpeg Assembly Engine for ReelAgent
+# Builds the standard-flow reel straight from ffmpeg, without moviepy.
+#
+# Each scene is a still image plus narration, so there is nothing to render
+# frame by frame in Python: ffmpeg loops the still (-loop 1), encodes it with
+# -tune stillimage (near-free P-frames) and pads the narration with silence.
+# The still is read at 1 fps and only duplicated to FPS after scaling, so the
+# decode/scale work is done once per second instead of once per frame.
+# Scene segments share identical codec parameters, so the final reel is a
+# concat-demuxer stream copy - no second encode, no frames in Python memory.
+#
+# Segments are independent, so they are encoded in parallel: the available
+# cores are split between concurrent ffmpeg processes (x264 threads per
+# encoder = cores // workers) and the final concat is I/O only.
+#
+# Ken Burns motion (VIDEO_MOTION) uses zoompan over the single decoded still:
+# every output frame is a crop window of that one image, so memory stays
+# constant however long the scene is (the moviepy resize(lambda t: ...)
+# version allocated per-frame arrays and ran out of memory). The still is
+# upscaled 2x first so the sub-pixel crop offsets don't visibly jitter.
+#
+# A preview (VIDEO_PREVIEW) is the same pipeline at PREVIEW_SIZE / PREVIEW_FPS
+# without motion - a few seconds of work, published before the full reel.
+
+import asyncio
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from core.config import settings
+from models import Scene, JobDB
+from services.audio_probe import get_audio_duration
+from services.image_postprocess import TARGET_SIZE
+
+FPS = 24
+SCENE_PADDING = 0.5   # Seconds of silence after each narration
+
+# Ken Burns: total zoom over a scene, and the moves cycled through scene by scene
+MOTION_ZOOM = 0.08
+MOTIONS = ["zoom_in", "pan", "zoom_out"]
+
+# Preview: a ninth of the pixels at half the frame rate, static shots
+PREVIEW_SIZE = (360, 640)
+PREVIEW_FPS = 12
+
+# Every segment must match exactly for the stream-copy concat
+AUDIO_RATE = 44100
+AUDIO_CHANNELS = 2
+
+
+def get_ffmpeg_binary() -> Optional[str]:
+    """ffmpeg on PATH, else the binary bundled with imageio-ffmpeg (moviepy's dependency)."""
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container/affinity limits)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def plan_encoders(segment_count: int) -> tuple[int, int]:
+    """(parallel ffmpeg workers, x264 threads per worker) for this machine."""
+    cpus = available_cpus()
+    workers = settings.VIDEO_ENCODE_WORKERS or cpus
+    workers = max(1, min(workers, segment_count, cpus))
+    return workers, max(1, cpus // workers)
+
+
+def run_ffmpeg(args: list[str], timeout: float = 600):
+    """Run ffmpeg quietly; raise RuntimeError with the tail of stderr on failure."""
+    binary = get_ffmpeg_binary()
+    if not binary:
+        raise RuntimeError("ffmpeg not found (install ffmpeg or imageio-ffmpeg)")
+
+    result = subprocess.run(
+        [binary, "-hide_banner", "-loglevel", "error", "-y", *args],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {result.stderr.strip()[-500:]}")
+
+
+def _fit_filter(width: int, height: int) -> str:
+    """Scale/pad any source image to exactly width x height."""
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+    )
+
+
+def motion_filter(motion: str, frames: int) -> str:
+    """zoompan filter producing `frames` frames of the given Ken Burns move from one still."""
+    width, height = TARGET_SIZE
+    last = max(1, frames - 1)
+    progress = f"on/{last}"
+    centre_x = "iw/2-(iw/zoom/2)"
+    centre_y = "ih/2-(ih/zoom/2)"
+
+    if motion == "zoom_in":
+        zoom, x, y = f"1+{MOTION_ZOOM}*{progress}", centre_x, centre_y
+    elif motion == "zoom_out":
+        zoom, x, y = f"{1 + MOTION_ZOOM}-{MOTION_ZOOM}*{progress}", centre_x, centre_y
+    elif motion == "pan":
+        zoom, x, y = f"{1 + MOTION_ZOOM}", f"(iw-iw/zoom)*{progress}", centre_y
+    else:
+        raise ValueError(f"Unknown motion: {motion}")
+
+    return (
+        f"{_fit_filter(width * 2, height * 2)},"
+        f"zoompan=z='{zoom}':x='{x}':y='{y}':d={frames}:s={width}x{height}:fps={FPS}"
+    )
+
+
+def encode_scene_segment(
+    image_path: str,
+    audio_path: str,
+    output_path: str,
+    duration: Optional[float] = None,
+    threads: int = 0,
+    preset: str = "ultrafast",
+    motion: Optional[str] = None,
+    size: Optional[tuple[int, int]] = None,
+    fps: int = FPS,
+):
+    """
+    Encode one still image + narration into an MP4 segment.
+
+    duration defaults to the narration length plus SCENE_PADDING. threads=0
+    lets x264 pick its own thread count. motion is one of MOTIONS (Ken Burns
+    pan/zoom) or None for a static shot. size/fps override TARGET_SIZE/FPS
+    for static shots (previews).
+    """
+    if duration is None:
+        audio_duration = get_audio_duration(audio_path)
+        if audio_duration is None:
+            raise RuntimeError(f"Could not read duration of {audio_path}")
+        duration = audio_duration + SCENE_PADDING
+
+    width, height = size or TARGET_SIZE
+    if motion:
+        # Single input frame; zoompan emits every output frame from it
+        frames = int(duration * FPS) + 1
+        image_input = ["-i", image_path]
+        video_filter = f"{motion_filter(motion, frames)},setsar=1,format=yuv420p"
+        tune = []
+    else:
+        image_input = ["-loop", "1", "-framerate", "1", "-i", image_path]
+        video_filter = f"{_fit_filter(width, height)},setsar=1,format=yuv420p,fps={fps}"
+        tune = ["-tune", "stillimage"]
+
+    run_ffmpeg([
+        *image_input,
+        "-i", audio_path,
+        "-t", f"{duration:.3f}",
+        "-vf", video_filter,
+        "-af", "apad",
+        "-c:v", "libx264", *tune, "-preset", preset,
+        "-threads", str(threads),
+        "-c:a", "aac", "-ar", str(AUDIO_RATE), "-ac", str(AUDIO_CHANNELS),
+        output_path,
+    ])
+    return output_path
+
+
+def write_concat_list(paths: list[str], list_path: str):
+    """Input list for the concat demuxer (absolute paths, quotes escaped)."""
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+
+def concat_segments(segment_paths: list[str], output_path: str, list_path: Optional[str] = None):
+    """Join identically-encoded segments with the concat demuxer (stream copy)."""
+    list_path = list_path or f"{output_path}.segments.txt"
+    write_concat_list(segment_paths, list_path)
+
+    try:
+        run_ffmpeg([
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-c", "copy", "-movflags", "+faststart",
+            output_path,
+        ])
+    finally:
+        os.remove(list_path)
+    return output_path
+
+
+def segment_options(index: int, preview: bool = False) -> dict:
+    """encode_scene_segment options for scene `index` (motion cycles through MOTIONS)."""
+    if preview:
+        return {"size": PREVIEW_SIZE, "fps": PREVIEW_FPS, "motion": None}
+    motion = MOTIONS[index % len(MOTIONS)] if settings.VIDEO_MOTION else None
+    return {"size": None, "fps": FPS, "motion": motion}
+
+
+def segment_key(image_path: str, audio_path: str, options: dict) -> str:
+    """Content hash of everything that goes into a segment - equal keys, identical segments."""
+    digest = hashlib.sha256()
+    for path in (image_path, audio_path):
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    size = options["size"] or TARGET_SIZE
+    digest.update(
+        f"{options['motion']}|{size[0]}x{size[1]}|{options['fps']}|{SCENE_PADDING}|"
+        f"{MOTION_ZOOM}|{AUDIO_RATE}|{AUDIO_CHANNELS}".encode("utf-8")
+    )
+    return digest.hexdigest()[:16]
+
+
+class SegmentPrefetcher:
+    """
+    Encodes scene segments into segment_dir while the job's other assets
+    are still being generated: each scene starts as soon as both its image
+    and narration exist. assemble_reel_ffmpeg later finds them by
+    segment_key and only has to concatenate. Best effort - a failed encode
+    is logged and simply redone at assembly time.
+    """
+
+    def __init__(self, segment_dir: str, scene_count: int, job_id: str = None):
+        self.segment_dir = segment_dir
+        self.job_id = job_id
+        workers, self.threads = plan_encoders(scene_count)
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._futures: dict[int, Future] = {}
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for future in self._futures.values() if not future.done())
+
+    def scene_ready(self, index: int, scene: Scene):
+        """Queue scene `index` once it has both assets (no-op before that, or if already queued)."""
+        if self._closed or index in self._futures or not (scene.image_path and scene.audio_path):
+            return
+        self._futures[index] = self._pool.submit(self._encode, index, scene.image_path, scene.audio_path)
+
+    def _encode(self, index: int, image_path: str, audio_path: str) -> str:
+        options = segment_options(index)
+        key = segment_key(image_path, audio_path, options)
+        segment_path = os.path.join(self.segment_dir, f"segment_{key}.mp4")
+        if os.path.exists(segment_path):
+            return segment_path
+
+        os.makedirs(self.segment_dir, exist_ok=True)
+        staged_path = os.path.join(self.segment_dir, f".encoding_{key}.mp4")
+        encode_scene_segment(image_path, audio_path, staged_path, threads=self.threads, **options)
+        os.replace(staged_path, segment_path)
+        if self.job_id: JobDB.add_log(self.job_id, f"   - Assembly Scene {index}: segment encoded early")
+        return segment_path
+
+    async def wait(self):
+        """Wait for every queued encode, then release the encoder threads."""
+        for index, future in self._futures.items():
+            try:
+                await asyncio.wrap_future(future)
+            except Exception as e:
+                msg = f"Early encode of scene {index} failed ({e}), will retry at assembly"
+                print(msg)
+                if self.job_id: JobDB.add_log(self.job_id, msg)
+        self.shutdown()
+
+    def shutdown(self):
+        """Drop queued encodes and release the threads (encodes already running finish on their own)."""
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def assemble_reel_ffmpeg(
+    scenes: list[Scene],
+    output_path: str,
+    workspace: str,
+    job_id: str = None,
+    preview: bool = False,
+    segment_dir: Optional[str] = None,
+) -> bool:
+    """
+    Assemble the reel with ffmpeg only (scene segments encoded in parallel,
+    then stream-copy concat). All intermediates go to `workspace` (see
+    services.workspace); the finished file is moved to output_path.
+    preview=True encodes at PREVIEW_SIZE / PREVIEW_FPS without motion.
+
+    With segment_dir, encoded segments are kept there under a content hash
+    (segment_key) and reused by the next assembly of the same job - after a
+    scene edit only that scene is re-encoded. Segments no longer used are
+    removed.
+    Raises on ffmpeg errors so the caller can fall back to moviepy.
+    """
+    prefix = "preview_" if preview else "segment_"
+    jobs, segments = [], []
+    for i, scene in enumerate(scenes):
+        if not (scene.image_path and scene.audio_path):
+            if job_id: JobDB.add_log(job_id, f"Skipping scene {i} due to missing assets.")
+            continue
+
+        options = segment_options(i, preview)
+        if segment_dir:
+            key = segment_key(scene.image_path, scene.audio_path, options)
+            segment_path = os.path.join(segment_dir, f"{prefix}{key}.mp4")
+            if os.path.exists(segment_path):
+                if job_id: JobDB.add_log(job_id, f"   - Assembly Scene {i}: segment already encoded, reused")
+                segments.append(segment_path)
+                continue
+        else:
+            segment_path = os.path.join(workspace, f"segment_{i}.mp4")
+        jobs.append((i, scene, options, segment_path))
+        segments.append(segment_path)
+
+    if not segments:
+        if job_id: JobDB.add_log(job_id, "ERROR: No valid clips created.")
+        return False
+
+    if jobs:
+        workers, threads = plan_encoders(len(jobs))
+        if job_id: JobDB.add_log(job_id, f"Encoding {len(jobs)} segments ({workers} parallel, {threads} threads each)...")
+
+        def encode(job):
+            i, scene, options, segment_path = job
+            # Encode in the workspace; a kept segment only appears once complete
+            staged_path = os.path.join(workspace, f"segment_{i}.mp4")
+            encode_scene_segment(scene.image_path, scene.audio_path, staged_path, threads=threads, **options)
+            if staged_path != segment_path:
+                os.makedirs(segment_dir, exist_ok=True)
+                shutil.move(staged_path, segment_path)
+            if job_id: JobDB.add_log(job_id, f"   - Assembly Scene {i}: segment encoded")
+            return segment_path
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # list() re-raises the first encode error
+            list(pool.map(encode, jobs))
+
+    if job_id: JobDB.add_log(job_id, f"Concatenating {len(segments)} segments to {output_path}...")
+    staged_path = os.path.join(workspace, "final.mp4")
+    concat_segments(segments, staged_path, list_path=os.path.join(workspace, "segments.txt"))
+    # Publish only a complete file (a rename when the workspace is on the same disk)
+    shutil.move(staged_path, output_path)
+
+    if segment_dir:
+        in_use = {os.path.basename(path) for path in segments}
+        for name in os.listdir(segment_dir):
+            if name.startswith(prefix) and name not in in_use:
+                os.remove(os.path.join(segment_dir, name))
+    return True
@@ -0,0 +1,122 @@
+# LRU File Store for ReelAgent
+# Shared base of the on-disk caches (services.image_cache, services.render_cache).
+#
+# Files live flat in cache_dir next to a JSON index of
+# key -> {file, bytes, last_used, ...subclass metadata}. Once the files
+# exceed max_bytes the least recently used are evicted; max_bytes <= 0
+# disables the store. All methods block - callers go through asyncio.to_thread.
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+
+class LRUFileStore:
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._index: Optional[dict] = None
+
+    # ----------------------------
+    # Index persistence
+    # ----------------------------
+    def _load(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    # ----------------------------
+    # File placement (overridable, e.g. hardlinks)
+    # ----------------------------
+    def _place(self, src: str, dst: str):
+        tmp_path = dst + ".tmp"
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+
+    # ----------------------------
+    # Store operations
+    # ----------------------------
+    def _entries(self) -> list[tuple[str, dict]]:
+        """Snapshot of (key, entry) pairs, e.g. for fuzzy matching."""
+        with self._lock:
+            return [(key, dict(entry)) for key, entry in self._load().items()]
+
+    def _get(self, key: str, output_path: str) -> Optional[str]:
+        """Place the file stored under key at output_path; None on a miss."""
+        if self.max_bytes <= 0:
+            return None
+
+        with self._lock:
+            index = self._load()
+            entry = index.get(key)
+            if entry is None:
+                return None
+
+            cached_path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(cached_path):
+                del index[key]
+                self._save()
+                return None
+
+            self._place(cached_path, output_path)
+            entry["last_used"] = time.time()
+            self._save()
+        return output_path
+
+    def _put(self, key: str, src_path: str, file_name: str, **metadata):
+        """Store src_path under key, evicting LRU entries if needed."""
+        if self.max_bytes <= 0 or not os.path.exists(src_path):
+            return
+
+        with self._lock:
+            index = self._load()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cached_path = os.path.join(self.cache_dir, file_name)
+            self._place(src_path, cached_path)
+
+            previous = index.get(key)
+            if previous and previous["file"] != file_name:
+                try:
+                    os.remove(os.path.join(self.cache_dir, previous["file"]))
+                except OSError:
+                    pass
+
+            index[key] = {
+                "file": file_name,
+                **metadata,
+                "bytes": os.path.getsize(cached_path),
+                "last_used": time.time(),
+            }
+            self._evict(index)
+            self._save()
+
+    def _evict(self, index: dict):
+        total = sum(entry["bytes"] for entry in index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            entry = index.pop(key)
+            total -= entry["bytes"]
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
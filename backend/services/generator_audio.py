@@ -3,6 +3,17 @@ import os
 import wave
 from gtts import gTTS
 
+from services.audio_probe import get_audio_duration
+
+PIPER_MODEL_PATH = os.path.abspath(
+    os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "piper_models",
+        "en_US-lessac-medium.onnx"
+    )
+)
+
 
 async def generate_audio(
     text: str,
@@ -24,14 +35,7 @@ async def generate_audio(
     # 1. Try Piper TTS
     # ----------------------------
     try:
-        model_path = os.path.abspath(
-            os.path.join(
-                os.path.dirname(__file__),
-                "..",
-                "piper_models",
-                "en_US-lessac-medium.onnx"
-            )
-        )
+        model_path = PIPER_MODEL_PATH
 
         if os.path.exists(model_path):
             print(f"Generating audio with Piper TTS ({os.path.basename(model_path)})")
@@ -51,8 +55,10 @@ async def generate_audio(
             await asyncio.to_thread(run_piper)
 
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                with wave.open(output_path, "rb") as wf:
-                    duration_sec = wf.getnframes() / wf.getframerate()
+                duration_sec = get_audio_duration(output_path)
+                if duration_sec is None:
+                    with wave.open(output_path, "rb") as wf:
+                        duration_sec = wf.getnframes() / wf.getframerate()
 
                 print(f"Piper audio saved: {output_path} ({duration_sec:.2f}s)")
                 create_dummy_json(text, output_path, duration_sec)
@@ -80,13 +86,96 @@ async def generate_audio(
     if not os.path.exists(output_path):
         raise RuntimeError("gTTS failed to generate audio")
 
-    # gTTS duration estimation (rough but acceptable)
-    estimated_duration = max(len(text.split()) / 2.5, 5.0)
+    # Exact duration from the MP3 frame headers (no decode, no ffprobe)
+    duration_sec = get_audio_duration(output_path)
+    if duration_sec is None:
+        # Unreadable headers - fall back to the rough word-rate estimate
+        duration_sec = max(len(text.split()) / 2.5, 5.0)
+        print(f"gTTS audio saved: {output_path} (~{duration_sec:.2f}s, estimated)")
+    else:
+        print(f"gTTS audio saved: {output_path} ({duration_sec:.2f}s)")
+
+    create_dummy_json(text, output_path, duration_sec)
+
+    return output_path, duration_sec
+
+
+async def generate_audio_batch(
+    texts: list[str],
+    output_paths: list[str],
+) -> list[tuple[str, float]]:
+    """
+    Synthesizes several narrations (one per scene) in a single TTS pass and
+    splits the result into one file per scene.
+
+    Piper loads its model once and records the sample offset at every scene
+    boundary; the PCM is then cut at those exact offsets. Without Piper (or
+    if the batch pass fails) the scenes go through generate_audio()
+    concurrently - batching buys gTTS nothing.
+
+    Returns:
+        [(audio_path, duration_in_seconds), ...] in scene order
+    """
+    if len(texts) != len(output_paths):
+        raise ValueError("texts and output_paths must have the same length")
+    if not texts:
+        return []
+
+    # ----------------------------
+    # 1. Try Piper TTS (single model load)
+    # ----------------------------
+    try:
+        if os.path.exists(PIPER_MODEL_PATH):
+            print(f"Generating {len(texts)} narrations with Piper TTS (batch)")
+            from piper import PiperVoice
 
-    print(f"gTTS audio saved: {output_path} (~{estimated_duration:.2f}s)")
-    create_dummy_json(text, output_path, estimated_duration)
+            def run_piper_batch():
+                voice_model = PiperVoice.load(PIPER_MODEL_PATH)
+                sample_rate = voice_model.config.sample_rate
 
-    return output_path, estimated_duration
+                pcm = bytearray()
+                offsets = [0]  # Scene markers, in samples
+                for text in texts:
+                    for chunk in voice_model.synthesize(text):
+                        pcm += chunk.audio_int16_bytes
+                    offsets.append(len(pcm) // 2)
+
+                for i, output_path in enumerate(output_paths):
+                    with wave.open(output_path, "wb") as wav_file:
+                        wav_file.setnchannels(1)
+                        wav_file.setsampwidth(2)  # 16-bit PCM
+                        wav_file.setframerate(sample_rate)
+                        wav_file.writeframes(pcm[offsets[i] * 2:offsets[i + 1] * 2])
+
+                return [
+                    (offsets[i + 1] - offsets[i]) / sample_rate
+                    for i in range(len(texts))
+                ]
+
+            durations = await asyncio.to_thread(run_piper_batch)
+
+            results = []
+            for text, output_path, duration_sec in zip(texts, output_paths, durations):
+                create_dummy_json(text, output_path, duration_sec)
+                results.append((output_path, duration_sec))
+
+            print(f"Piper batch audio saved: {len(results)} scenes ({sum(durations):.2f}s total)")
+            return results
+
+        else:
+            print("Piper model not found, skipping.")
+
+    except Exception as e:
+        print("Piper batch TTS failed:", e)
+
+    # ----------------------------
+    # 2. Fallback: one generate_audio() call per scene, concurrently
+    # ----------------------------
+    # (gTTS requests one part per ~100 characters anyway, so a joined
+    # narration saves no round trips and would only serialize them)
+    return list(await asyncio.gather(
+        *(generate_audio(text, output_path) for text, output_path in zip(texts, output_paths))
+    ))
 
 
 def create_dummy_json(text: str, output_path: str, duration_sec: float):
@@ -1,13 +1,40 @@
 import os
 import time
 import random
-import requests
+import base64
+import asyncio
 import urllib.parse
-from io import BytesIO
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Optional
+
+import httpx
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+
 from core.config import settings
+from services import rate_limit
+from services.provider_health import ProviderSkipped, scoreboard
+from services.job_poller import PENDING, Pending, get_poller
+from services.image_cache import image_cache
+from services.http_client import make_async_client
+from services.image_postprocess import finalize_image, save_image
+
+# Paid providers: only raced in hedged mode within IMAGE_HEDGE_PAID_CAPS
+PAID_PROVIDERS = {"replicate", "getimg", "segmind"}
+
+# Launch times per paid provider within the last IMAGE_HEDGE_PAID_WINDOW seconds
+_hedge_launches: dict[str, deque] = {}
+
+# Max images per request for providers that accept several per call
+BATCH_LIMITS = {
+    "replicate": 4,     # num_outputs
+    "stablehorde": 4,   # params.n
+    "segmind": 4,       # samples
+}
 
-def generate_image_hf(prompt: str, output_path: str):
+
+async def generate_image_hf(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Using HuggingFace Inference API - FREE models only"""
     models = [
         "runwayml/stable-diffusion-v1-5",      # Reliable, usually free
@@ -20,32 +47,40 @@ def generate_image_hf(prompt: str, output_path: str):
     if hasattr(settings, 'HF_TOKEN') and settings.HF_TOKEN:
         headers = {"Authorization": f"Bearer {settings.HF_TOKEN}"}
     
-    for model in models:
+    # Healthiest models first; models with an open circuit are skipped
+    ranked = scoreboard.rank((f"huggingface:{m}", 20 + i) for i, m in enumerate(models))
+    if not ranked:
+        # Every model is paused (breaker or warm-up) - that's on the models, not the provider
+        raise ProviderSkipped("all HuggingFace models paused")
+    
+    for key in ranked:
+        model = key.split(":", 1)[1]
+        started = time.monotonic()
         try:
             # Revert to router as requested by API error message
             API_URL = f"https://router.huggingface.co/models/{model}"
             payload = {"inputs": prompt}
             
+            await rate_limit.acquire("huggingface")
             print(f"Attempting HuggingFace ({model.split('/')[-1]})... url: {API_URL}")
             
-            response = requests.post(API_URL, headers=headers, json=payload, timeout=60)
+            response = await client.post(API_URL, headers=headers, json=payload, timeout=60)
             
             if response.status_code == 200:
                 # Check if we actually got an image
                 if 'application/json' in response.headers.get('Content-Type', ''):
                     print(f"HF returned JSON instead of image: {response.text[:100]}")
+                    scoreboard.record_failure(key, time.monotonic() - started)
                     continue
 
-                img = Image.open(BytesIO(response.content))
-                # Ensure correct size
-                if img.size != (1080, 1920):
-                    img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-                img.save(output_path, quality=95)
+                await asyncio.to_thread(finalize_image, response.content, output_path)
+                scoreboard.record_success(key, time.monotonic() - started)
                 print(f"✓ HF Image saved: {output_path}")
                 return output_path
             
             elif response.status_code == 503:
-                # Model is loading
+                # Model is loading - pause it for its warm-up time instead of
+                # waiting here; other providers/models get tried meanwhile
                 estimated_time = 20
                 try:
                     data = response.json()
@@ -53,78 +88,73 @@ def generate_image_hf(prompt: str, output_path: str):
                 except:
                     pass
                 
-                print(f"Model loading, waiting {estimated_time}s...")
-                time.sleep(estimated_time + 2) # Wait a bit extra
-                
-                # Retry once
-                response = requests.post(API_URL, headers=headers, json=payload, timeout=60)
-                if response.status_code == 200:
-                    img = Image.open(BytesIO(response.content))
-                    if img.size != (1080, 1920):
-                        img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-                    img.save(output_path, quality=95)
-                    print(f"✓ HF Image saved: {output_path}")
-                    return output_path
+                print(f"Model loading (~{estimated_time}s), moving on")
+                scoreboard.record_failure(key, time.monotonic() - started, cooldown=estimated_time + 2)
                 continue
             else:
                 print(f"HF Error {response.status_code} for {model}: {response.text[:200]}")
+                scoreboard.record_failure(key, time.monotonic() - started)
                 
         except Exception as e:
             print(f"HF {model} error: {e}")
+            scoreboard.record_failure(key, time.monotonic() - started)
             continue
     
     return None
 
 
-def generate_image_hf_spaces(prompt: str, output_path: str):
-    """Using HuggingFace Spaces - Fallback to standard HF if spaces fail"""
-    # Just redirecting to the standard HF function as the "Spaces" direct URL was just a router anyway
-    # and likely same/similar to Inference API.
-    return generate_image_hf(prompt, output_path)
-
-
-def generate_image_replicate(prompt: str, output_path: str):
-    """Using Replicate API"""
+async def generate_images_replicate(client: httpx.AsyncClient, prompt: str, output_paths: list[str]) -> list[str]:
+    """Using Replicate API - one prediction returns up to 4 images (num_outputs)"""
     if not hasattr(settings, 'REPLICATE_API_TOKEN') or not settings.REPLICATE_API_TOKEN:
-        return None
+        return []
     
+    saved = []
     try:
         import replicate
         
-        print("Attempting Replicate (FLUX)...")
+        await rate_limit.acquire("replicate")
+        print(f"Attempting Replicate (FLUX, {len(output_paths)} images)...")
         # Using FLUX.1-schnell on Replicate (fast and good)
-        output = replicate.run(
+        # The replicate client is blocking - keep it off the event loop
+        output = await asyncio.to_thread(
+            replicate.run,
             "black-forest-labs/flux-schnell", 
             input={
                 "prompt": prompt,
-                "num_outputs": 1,
+                "num_outputs": min(len(output_paths), BATCH_LIMITS["replicate"]),
                 "aspect_ratio": "9:16",
                 "output_format": "jpg",
                 "output_quality": 95
             }
         )
         
-        # Download image
-        img_url = output[0] if isinstance(output, list) else output
+        img_urls = output if isinstance(output, list) else [output]
         
-        img_response = requests.get(img_url, timeout=30)
-        if img_response.status_code == 200:
-            img = Image.open(BytesIO(img_response.content))
-            img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-            img.save(output_path, quality=95)
-            print(f"✓ Replicate image saved: {output_path}")
-            return output_path
+        # Download images
+        for img_url, output_path in zip(img_urls, output_paths):
+            img_response = await client.get(str(img_url), timeout=30)
+            if img_response.status_code == 200:
+                await asyncio.to_thread(finalize_image, img_response.content, output_path)
+                print(f"✓ Replicate image saved: {output_path}")
+                saved.append(output_path)
     except Exception as e:
         print(f"Replicate failed: {e}")
-    return None
+    return saved
+
+
+async def generate_image_replicate(client: httpx.AsyncClient, prompt: str, output_path: str):
+    """Using Replicate API"""
+    saved = await generate_images_replicate(client, prompt, [output_path])
+    return saved[0] if saved else None
 
 
-def generate_image_getimg(prompt: str, output_path: str):
+async def generate_image_getimg(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Using GetImg.ai API (100 images/month free)"""
     if not hasattr(settings, 'GETIMG_API_KEY') or not settings.GETIMG_API_KEY:
         return None
     
     try:
+        await rate_limit.acquire("getimg")
         print("Attempting GetImg.ai API...")
         
         url = "https://api.getimg.ai/v1/stable-diffusion/text-to-image"
@@ -142,18 +172,16 @@ def generate_image_getimg(prompt: str, output_path: str):
             "guidance": 7.5
         }
         
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = await client.post(url, headers=headers, json=payload, timeout=60)
         
         if response.status_code == 200:
             data = response.json()
             img_data = data.get('image')
             
             # Decode base64 image
-            import base64
             img_bytes = base64.b64decode(img_data)
             
-            with open(output_path, 'wb') as f:
-                f.write(img_bytes)
+            await asyncio.to_thread(finalize_image, img_bytes, output_path)
             print(f"✓ GetImg image saved: {output_path}")
             return output_path
     except Exception as e:
@@ -161,13 +189,17 @@ def generate_image_getimg(prompt: str, output_path: str):
     return None
 
 
-def generate_image_segmind(prompt: str, output_path: str):
-    """Using Segmind API (Free tier available)"""
+async def generate_images_segmind(client: httpx.AsyncClient, prompt: str, output_paths: list[str]) -> list[str]:
+    """Using Segmind API (Free tier available) - several samples per request"""
     if not hasattr(settings, 'SEGMIND_API_KEY') or not settings.SEGMIND_API_KEY:
-        return None
+        return []
     
+    saved = []
     try:
-        print("Attempting Segmind API...")
+        samples = min(len(output_paths), BATCH_LIMITS["segmind"])
+        
+        await rate_limit.acquire("segmind")
+        print(f"Attempting Segmind API ({samples} images)...")
         
         url = "https://api.segmind.com/v1/sd1.5-txt2img"
         headers = {
@@ -178,7 +210,7 @@ def generate_image_segmind(prompt: str, output_path: str):
         payload = {
             "prompt": prompt,
             "negative_prompt": "low quality, blurry, distorted",
-            "samples": 1,
+            "samples": samples,
             "scheduler": "UniPC",
             "num_inference_steps": 25,
             "guidance_scale": 8,
@@ -186,28 +218,46 @@ def generate_image_segmind(prompt: str, output_path: str):
             "height": 1920,
             "seed": random.randint(1, 1000000)
         }
+        if samples > 1:
+            payload["base64"] = True  # Multiple samples come back as a JSON list
         
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
+        response = await client.post(url, headers=headers, json=payload, timeout=60 * samples)
         
         if response.status_code == 200:
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
-            print(f"✓ Segmind image saved: {output_path}")
-            return output_path
+            if 'application/json' in response.headers.get('Content-Type', ''):
+                data = response.json()
+                images = data.get('images') or data.get('image') or []
+                if isinstance(images, str):
+                    images = [images]
+                contents = [base64.b64decode(img) for img in images]
+            else:
+                contents = [response.content]
+            
+            for content, output_path in zip(contents, output_paths):
+                await asyncio.to_thread(finalize_image, content, output_path)
+                print(f"✓ Segmind image saved: {output_path}")
+                saved.append(output_path)
     except Exception as e:
         print(f"Segmind failed: {e}")
-    return None
+    return saved
+
+
+async def generate_image_segmind(client: httpx.AsyncClient, prompt: str, output_path: str):
+    """Using Segmind API (Free tier available)"""
+    saved = await generate_images_segmind(client, prompt, [output_path])
+    return saved[0] if saved else None
 
 
-def generate_image_deepai(prompt: str, output_path: str):
+async def generate_image_deepai(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Using DeepAI API (Free with rate limits)"""
     if not hasattr(settings, 'DEEPAI_API_KEY') or not settings.DEEPAI_API_KEY:
         return None
     
     try:
+        await rate_limit.acquire("deepai")
         print("Attempting DeepAI API...")
         
-        response = requests.post(
+        response = await client.post(
             "https://api.deepai.org/api/text2img",
             data={'text': prompt},
             headers={'api-key': settings.DEEPAI_API_KEY},
@@ -219,12 +269,9 @@ def generate_image_deepai(prompt: str, output_path: str):
             img_url = data.get('output_url')
             
             # Download image
-            img_response = requests.get(img_url, timeout=30)
+            img_response = await client.get(img_url, timeout=30)
             if img_response.status_code == 200:
-                # Resize to desired dimensions
-                img = Image.open(BytesIO(img_response.content))
-                img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-                img.save(output_path, quality=95)
+                await asyncio.to_thread(finalize_image, img_response.content, output_path)
                 print(f"✓ DeepAI image saved: {output_path}")
                 return output_path
     except Exception as e:
@@ -232,7 +279,7 @@ def generate_image_deepai(prompt: str, output_path: str):
     return None
 
 
-def generate_image_pollinations_smart(prompt: str, output_path: str):
+async def generate_image_pollinations_smart(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Pollinations with aggressive rate limit handling"""
     clean_prompt = prompt.strip()[:800]
     encoded_prompt = urllib.parse.quote(clean_prompt)
@@ -242,15 +289,15 @@ def generate_image_pollinations_smart(prompt: str, output_path: str):
     
     for attempt in range(3):
         try:
-            # Aggressive delays to avoid rate limits
+            # Aggressive delays to avoid rate limits (non-blocking: other scenes keep going)
             if attempt > 0:
                 wait_time = 120 * (attempt + 1)  # 2min, 4min, 6min
                 print(f"Waiting {wait_time}s before retry...")
-                time.sleep(wait_time)
-            else:
-                # Random initial delay
-                initial_wait = random.uniform(5, 10)
-                time.sleep(initial_wait)
+                await asyncio.sleep(wait_time)
+            
+            # Shared token bucket spaces requests across all scenes/jobs
+            # (replaces the old random 5-10s initial delay)
+            await rate_limit.acquire("pollinations")
             
             model_name = models[attempt % len(models)]
             image_url = f"https://image.pollinations.ai/prompt/{encoded_prompt}?width=1080&height=1920&nologo=true&seed={seed}&enhance=true&model={model_name}"
@@ -262,14 +309,12 @@ def generate_image_pollinations_smart(prompt: str, output_path: str):
                 'Accept': 'image/*'
             }
             
-            response = requests.get(image_url, headers=headers, timeout=45)
+            response = await client.get(image_url, headers=headers, timeout=45)
             
             if response.status_code == 200 and 'image' in response.headers.get('Content-Type', ''):
-                with open(output_path, 'wb') as f:
-                    f.write(response.content)
-                if os.path.getsize(output_path) > 1000:
-                    print(f"✓ Pollinations image saved: {output_path}")
-                    return output_path
+                await asyncio.to_thread(finalize_image, response.content, output_path)
+                print(f"✓ Pollinations image saved: {output_path}")
+                return output_path
             elif response.status_code == 429:
                 print(f"Rate limited (429), will retry with longer delay")
                 continue
@@ -282,9 +327,10 @@ def generate_image_pollinations_smart(prompt: str, output_path: str):
     return None
 
 
-def generate_image_craiyon(prompt: str, output_path: str):
+async def generate_image_craiyon(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Using Craiyon (formerly DALL-E mini) - No API key needed"""
     try:
+        await rate_limit.acquire("craiyon")
         print("Attempting Craiyon API...")
         
         # V3 endpoint with better parameters
@@ -295,7 +341,7 @@ def generate_image_craiyon(prompt: str, output_path: str):
             "negative_prompt": "low quality, blurry, distorted"
         }
         
-        response = requests.post(url, json=payload, timeout=180)
+        response = await client.post(url, json=payload, timeout=180)
         
         if response.status_code == 200:
             data = response.json()
@@ -303,12 +349,9 @@ def generate_image_craiyon(prompt: str, output_path: str):
             
             if images:
                 # Get first image (base64 encoded)
-                import base64
                 img_data = base64.b64decode(images[0])
                 
-                img = Image.open(BytesIO(img_data))
-                img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-                img.save(output_path, quality=95)
+                await asyncio.to_thread(finalize_image, img_data, output_path)
                 print(f"✓ Craiyon image saved: {output_path}")
                 return output_path
         else:
@@ -318,9 +361,10 @@ def generate_image_craiyon(prompt: str, output_path: str):
     return None
 
 
-def generate_image_prodia(prompt: str, output_path: str):
+async def generate_image_prodia(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Using Prodia - Completely FREE, no API key needed"""
     try:
+        await rate_limit.acquire("prodia")
         print("Attempting Prodia API...")
         
         # Generate job
@@ -336,34 +380,33 @@ def generate_image_prodia(prompt: str, output_path: str):
             "aspect_ratio": "portrait"
         }
         
-        response = requests.post(url, json=payload, timeout=30)
+        response = await client.post(url, json=payload, timeout=30)
         
         if response.status_code == 200:
             job = response.json()
             job_id = job.get('job')
+            status_url = f"https://api.prodia.com/v1/job/{job_id}"
             
-            # Wait for completion (max 60 seconds)
-            for _ in range(30):
-                time.sleep(2)
-                status_url = f"https://api.prodia.com/v1/job/{job_id}"
-                status_response = requests.get(status_url, timeout=10)
-                
-                if status_response.status_code == 200:
-                    status = status_response.json()
-                    if status.get('status') == 'succeeded':
-                        img_url = status.get('imageUrl')
-                        
-                        # Download image
-                        img_response = requests.get(img_url, timeout=30)
-                        if img_response.status_code == 200:
-                            img = Image.open(BytesIO(img_response.content))
-                            img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-                            img.save(output_path, quality=95)
-                            print(f"✓ Prodia image saved: {output_path}")
-                            return output_path
-                    elif status.get('status') == 'failed':
-                        print("Prodia job failed")
-                        break
+            async def check(poll_client: httpx.AsyncClient):
+                status_response = await poll_client.get(status_url, timeout=10)
+                if status_response.status_code != 200:
+                    return PENDING
+                status = status_response.json()
+                if status.get('status') == 'succeeded':
+                    return status.get('imageUrl')
+                if status.get('status') == 'failed':
+                    raise RuntimeError("Prodia job failed")
+                return PENDING
+            
+            # Wait for completion (max 60 seconds) on the shared poller
+            img_url = await get_poller().wait(f"prodia:{job_id}", check, timeout=60)
+            
+            # Download image
+            img_response = await client.get(img_url, timeout=30)
+            if img_response.status_code == 200:
+                await asyncio.to_thread(finalize_image, img_response.content, output_path)
+                print(f"✓ Prodia image saved: {output_path}")
+                return output_path
         else:
             print(f"Prodia error {response.status_code}")
             
@@ -372,10 +415,14 @@ def generate_image_prodia(prompt: str, output_path: str):
     return None
 
 
-def generate_image_stablehorde(prompt: str, output_path: str):
-    """Using Stable Horde - Free, community-powered"""
+async def generate_images_stablehorde(client: httpx.AsyncClient, prompt: str, output_paths: list[str]) -> list[str]:
+    """Using Stable Horde - Free, community-powered; one queued job yields n images"""
+    saved = []
     try:
-        print("Attempting Stable Horde API...")
+        count = min(len(output_paths), BATCH_LIMITS["stablehorde"])
+        
+        await rate_limit.acquire("stablehorde")
+        print(f"Attempting Stable Horde API ({count} images)...")
         
         # Submit generation request
         url = "https://stablehorde.net/api/v2/generate/async"
@@ -391,59 +438,69 @@ def generate_image_stablehorde(prompt: str, output_path: str):
                 "height": 768,
                 "steps": 20,
                 "cfg_scale": 7.5,
-                "sampler_name": "k_euler"
+                "sampler_name": "k_euler",
+                "n": count
             },
             "nsfw": False,
             "models": ["Deliberate"]
         }
         
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = await client.post(url, json=payload, headers=headers, timeout=30)
         
         if response.status_code == 202:
             data = response.json()
             job_id = data.get('id')
-            
-            # Poll for completion (max 2 minutes)
             check_url = f"https://stablehorde.net/api/v2/generate/check/{job_id}"
+            result_url = f"https://stablehorde.net/api/v2/generate/status/{job_id}"
             
-            for _ in range(60):
-                time.sleep(2)
-                check_response = requests.get(check_url, timeout=10)
+            async def check(poll_client: httpx.AsyncClient):
+                check_response = await poll_client.get(check_url, timeout=10)
+                if check_response.status_code != 200:
+                    return PENDING
+                status = check_response.json()
+                if not status.get('done'):
+                    if status.get('faulted'):
+                        raise RuntimeError("Stable Horde job faulted")
+                    # Horde reports its own ETA - don't poll before it
+                    return Pending(retry_after=status.get('wait_time'))
                 
-                if check_response.status_code == 200:
-                    status = check_response.json()
-                    if status.get('done'):
-                        # Get the result
-                        result_url = f"https://stablehorde.net/api/v2/generate/status/{job_id}"
-                        result_response = requests.get(result_url, timeout=10)
-                        
-                        if result_response.status_code == 200:
-                            result = result_response.json()
-                            generations = result.get('generations', [])
-                            
-                            if generations:
-                                img_url = generations[0].get('img')
-                                
-                                # Download image
-                                img_response = requests.get(img_url, timeout=30)
-                                if img_response.status_code == 200:
-                                    img = Image.open(BytesIO(img_response.content))
-                                    img = img.resize((1080, 1920), Image.Resampling.LANCZOS)
-                                    img.save(output_path, quality=95)
-                                    print(f"✓ Stable Horde image saved: {output_path}")
-                                    return output_path
-                        break
+                # Get the result
+                result_response = await poll_client.get(result_url, timeout=10)
+                if result_response.status_code != 200:
+                    raise RuntimeError(f"Stable Horde status {result_response.status_code}")
+                generations = result_response.json().get('generations', [])
+                if not generations:
+                    raise RuntimeError("Stable Horde returned no generations")
+                return [generation.get('img') for generation in generations]
+            
+            # Poll for completion (max 2 minutes) on the shared poller
+            img_urls = await get_poller().wait(f"stablehorde:{job_id}", check, timeout=120)
+            
+            # Download images
+            for img_url, output_path in zip(img_urls, output_paths):
+                img_response = await client.get(img_url, timeout=30)
+                if img_response.status_code == 200:
+                    await asyncio.to_thread(finalize_image, img_response.content, output_path)
+                    print(f"✓ Stable Horde image saved: {output_path}")
+                    saved.append(output_path)
         else:
             print(f"Stable Horde error {response.status_code}")
             
     except Exception as e:
         print(f"Stable Horde failed: {e}")
-    return None
+    return saved
+
+
+async def generate_image_stablehorde(client: httpx.AsyncClient, prompt: str, output_path: str):
+    """Using Stable Horde - Free, community-powered"""
+    saved = await generate_images_stablehorde(client, prompt, [output_path])
+    return saved[0] if saved else None
 
 
-def generate_image_dezgo(prompt: str, output_path: str):
+async def generate_image_dezgo(client: httpx.AsyncClient, prompt: str, output_path: str):
     """Using DezGo - Free API, no key needed"""
     try:
+        await rate_limit.acquire("dezgo")
         print("Attempting DezGo API...")
         
         url = "https://api.dezgo.com/text2image"
@@ -458,11 +515,10 @@ def generate_image_dezgo(prompt: str, output_path: str):
             "sampler": "k_euler"
         }
         
-        response = requests.post(url, data=payload, timeout=90)
+        response = await client.post(url, data=payload, timeout=90)
         
         if response.status_code == 200:
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+            await asyncio.to_thread(finalize_image, response.content, output_path)
             print(f"✓ DezGo image saved: {output_path}")
             return output_path
         else:
@@ -473,78 +529,274 @@ def generate_image_dezgo(prompt: str, output_path: str):
     return None
 
 
-def create_placeholder_image(prompt: str, output_path: str):
+# Placeholder gradients: style -> (top RGB, bottom RGB)
+PLACEHOLDER_GRADIENTS = {
+    "default": ((20, 20, 40), (80, 60, 120)),
+}
+
+PLACEHOLDER_FONTS = [
+    ("C:/Windows/Fonts/arialbd.ttf", "C:/Windows/Fonts/arial.ttf"),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+]
+
+
+@lru_cache(maxsize=1)
+def _placeholder_fonts():
+    """(large, small) fonts, resolved from disk once per process."""
+    for bold_path, regular_path in PLACEHOLDER_FONTS:
+        if os.path.exists(bold_path):
+            try:
+                return ImageFont.truetype(bold_path, 60), ImageFont.truetype(regular_path, 40)
+            except OSError:
+                continue
+    return ImageFont.load_default(), ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def _centered_x(text: str, large: bool, width: int) -> int:
+    """Memoized x offset that centers text horizontally."""
+    font = _placeholder_fonts()[0 if large else 1]
+    bbox = font.getbbox(text)
+    return (width - (bbox[2] - bbox[0])) // 2
+
+
+def _placeholder_base(style: str, size: tuple[int, int]) -> Image.Image:
+    """Gradient plus the fixed caption for this style/size (shared - callers must copy)."""
+    # Styles without their own gradient share the default's cached image
+    top, bottom = PLACEHOLDER_GRADIENTS.get(style, PLACEHOLDER_GRADIENTS["default"])
+    return _gradient_base(top, bottom, size)
+
+
+@lru_cache(maxsize=16)
+def _gradient_base(top: tuple, bottom: tuple, size: tuple[int, int]) -> Image.Image:
+    width, height = size
+    
+    # One vectorized row ramp broadcast across the width (was one draw.line per row)
+    t = np.arange(height, dtype=np.float32)[:, None] / height
+    rows = np.asarray(top, dtype=np.float32) + t * (np.asarray(bottom, dtype=np.float32) - np.asarray(top, dtype=np.float32))
+    pixels = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (height, width, 3))
+    img = Image.fromarray(np.ascontiguousarray(pixels), "RGB")
+    
+    font_large, _ = _placeholder_fonts()
+    draw = ImageDraw.Draw(img)
+    draw.text((_centered_x("Image Generation", True, width), 800), "Image Generation", fill=(255, 255, 255), font=font_large)
+    draw.text((_centered_x("Placeholder", True, width), 900), "Placeholder", fill=(200, 200, 255), font=font_large)
+    return img
+
+
+def create_placeholder_image(prompt: str, output_path: str, style: str = "default", size: tuple[int, int] = (1080, 1920)):
     """Creates an attractive placeholder image with gradient background"""
     try:
-        img = Image.new('RGB', (1080, 1920), color=(20, 20, 40))
-        draw = ImageDraw.Draw(img)
-        
-        # Add gradient effect
-        for y in range(1920):
-            r = int(20 + (y / 1920) * 60)
-            g = int(20 + (y / 1920) * 40)
-            b = int(40 + (y / 1920) * 80)
-            draw.line([(0, y), (1080, y)], fill=(r, g, b))
-        
-        try:
-            # Try to load standard fonts
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-            
-            if os.path.exists("C:/Windows/Fonts/arialbd.ttf"):
-                font_large = ImageFont.truetype("C:/Windows/Fonts/arialbd.ttf", 60)
-                font_small = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 40)
-            elif os.path.exists("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"):
-                font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 60)
-                font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 40)
-        except:
-            pass  # Use defaults
-        
-        text1 = "Image Generation"
-        text2 = "Placeholder"
-        
-        bbox1 = draw.textbbox((0, 0), text1, font=font_large)
-        bbox2 = draw.textbbox((0, 0), text2, font=font_large)
-        
-        x1 = (1080 - (bbox1[2] - bbox1[0])) // 2
-        x2 = (1080 - (bbox2[2] - bbox2[0])) // 2
-        
-        draw.text((x1, 800), text1, fill=(255, 255, 255), font=font_large)
-        draw.text((x2, 900), text2, fill=(200, 200, 255), font=font_large)
+        img = _placeholder_base(style, size).copy()
+        _, font_small = _placeholder_fonts()
         
         prompt_preview = prompt[:60] + "..." if len(prompt) > 60 else prompt
-        bbox3 = draw.textbbox((0, 0), prompt_preview, font=font_small)
-        x3 = (1080 - (bbox3[2] - bbox3[0])) // 2
-        draw.text((x3, 1050), prompt_preview, fill=(150, 150, 200), font=font_small)
+        ImageDraw.Draw(img).text(
+            (_centered_x(prompt_preview, False, size[0]), 1050),
+            prompt_preview,
+            fill=(150, 150, 200),
+            font=font_small,
+        )
         
-        img.save(output_path, quality=95)
+        save_image(img, output_path)
         print(f"✓ Placeholder created: {output_path}")
         return output_path
         
     except Exception as ex:
         print(f"Placeholder creation failed: {ex}")
-        img = Image.new('RGB', (1080, 1920), color=(40, 40, 80))
+        img = Image.new('RGB', size, color=(40, 40, 80))
         img.save(output_path)
         return output_path
 
 
-def generate_image(prompt: str, output_path: str, retries: int = 4):
+# Provider chain: (scoreboard key, generator, required API key setting, prior latency in seconds)
+# Priors only decide the order until real measurements arrive; they follow the
+# original hand-tuned priority (free & reliable first, rate-limited last).
+IMAGE_PROVIDERS = [
+    # Top tier: Free, reliable, good quality
+    ("huggingface", generate_image_hf, None, 15),          # FLUX.1-schnell, SD (per-model health inside)
+    ("prodia", generate_image_prodia, None, 20),           # Free, no key, reliable
+    ("stablehorde", generate_image_stablehorde, None, 30), # Free, community-powered
+    ("dezgo", generate_image_dezgo, None, 35),             # Free, no key
+    ("craiyon", generate_image_craiyon, None, 45),         # Free, slower but reliable
+    
+    # Paid/Limited APIs (if configured)
+    ("replicate", generate_image_replicate, "REPLICATE_API_TOKEN", 50),
+    ("getimg", generate_image_getimg, "GETIMG_API_KEY", 55),
+    ("segmind", generate_image_segmind, "SEGMIND_API_KEY", 60),
+    ("deepai", generate_image_deepai, "DEEPAI_API_KEY", 65),
+    
+    # Last resort free option (rate limited)
+    ("pollinations", generate_image_pollinations_smart, None, 120),
+]
+
+
+def get_ranked_providers() -> list[tuple]:
+    """Configured providers ordered by expected time-to-image, open circuits removed."""
+    configured = [
+        entry for entry in IMAGE_PROVIDERS
+        if entry[2] is None or getattr(settings, entry[2], "")
+    ]
+    by_key = {entry[0]: entry for entry in configured}
+    ranked = scoreboard.rank((entry[0], entry[3]) for entry in configured)
+    return [by_key[key] for key in ranked]
+
+
+def _hedge_launches_in_window(key: str) -> deque:
+    now = time.monotonic()
+    launches = _hedge_launches.setdefault(key, deque())
+    while launches and now - launches[0] >= settings.IMAGE_HEDGE_PAID_WINDOW:
+        launches.popleft()
+    return launches
+
+
+def _has_hedge_slot(key: str) -> bool:
+    """Whether a provider may join a hedge race (paid providers need budget left in the window)."""
+    if key not in PAID_PROVIDERS:
+        return True
+    return len(_hedge_launches_in_window(key)) < settings.IMAGE_HEDGE_PAID_CAPS.get(key, 0)
+
+
+def _claim_hedge_slot(key: str) -> bool:
+    """Spend a paid provider's budget as it actually launches; False if it's used up meanwhile."""
+    if not _has_hedge_slot(key):
+        return False
+    if key in PAID_PROVIDERS:
+        _hedge_launches[key].append(time.monotonic())
+    return True
+
+
+async def _run_provider(client: httpx.AsyncClient, key: str, generator, prompt: str, output_path: str):
+    """Run one provider and record the outcome on the health scoreboard."""
+    started = time.monotonic()
+    try:
+        result = await generator(client, prompt, output_path)
+    except ProviderSkipped as e:
+        print(f"{generator.__name__} skipped: {e}")
+        return None
+    except Exception as e:
+        print(f"{generator.__name__} failed: {e}")
+        result = None
+    elapsed = time.monotonic() - started
+    
+    if result:
+        scoreboard.record_success(key, elapsed)
+    else:
+        scoreboard.record_failure(key, elapsed)
+    return result
+
+
+async def generate_image_hedged(
+    client: httpx.AsyncClient,
+    prompt: str,
+    output_path: str,
+    providers: list[tuple],
+):
+    """
+    Race several providers for one image and keep the first valid result.
+
+    Each provider writes to its own temp file; the winner is moved to
+    output_path and the other tasks are cancelled (in-flight requests and
+    polling waits abort immediately). With IMAGE_HEDGE_STAGGER > 0, provider
+    N only starts N * stagger seconds in, and only if nobody has won yet.
+    
+    Returns:
+        (result_path or None, list of provider keys that were launched)
+    """
+    root, ext = os.path.splitext(output_path)
+    stagger = settings.IMAGE_HEDGE_STAGGER
+
+    racers = []
+    for entry in providers:
+        if len(racers) >= settings.IMAGE_HEDGE_WIDTH:
+            break
+        if _has_hedge_slot(entry[0]):
+            racers.append(entry)
+
+    if not racers:
+        return None, []
+    raced = [entry[0] for entry in racers]
+    launched = []
+
+    async def run(position: int, key: str, generator):
+        if position and stagger > 0:
+            await asyncio.sleep(position * stagger)
+        # Only a racer that really launches spends paid budget
+        if not _claim_hedge_slot(key):
+            return key, None
+        launched.append(key)
+        
+        tmp_path = f"{root}.{key}{ext}"
+        try:
+            result = await _run_provider(client, key, generator, prompt, tmp_path)
+        except asyncio.CancelledError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if result and os.path.exists(tmp_path):
+            return key, tmp_path
+        return key, None
+
+    print(f"Hedging across: {', '.join(raced)}")
+    pending = {
+        asyncio.create_task(run(i, key, generator))
+        for i, (key, generator, _, _) in enumerate(racers)
+    }
+    winner = None
+    try:
+        while pending and not winner:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key, tmp_path = task.result()
+                if not tmp_path:
+                    continue
+                if winner:
+                    os.remove(tmp_path)  # Finished in the same tick as the winner
+                else:
+                    os.replace(tmp_path, output_path)
+                    winner = key
+        if winner:
+            print(f"✓ Hedge won by {winner}")
+            return output_path, launched
+        return None, launched
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def generate_image(prompt: str, output_path: str, retries: int = 4, style: str = "", use_cache: bool = True):
     """
     Generate an image from text prompt using multiple fallback methods.
     
-    Priority order:
+    The persistent image cache (services.image_cache) is checked first; only
+    on a miss are providers contacted, and their result is cached.
+    
+    Fully asynchronous: provider waits never block a thread, and requests are
+    throttled per provider by shared token buckets (services.rate_limit), so
+    many scenes/jobs can generate at once within each provider's quota.
+    
+    Providers are tried in order of expected time-to-image, learned from a
+    shared health scoreboard (success rate and latency per provider/model).
+    Providers that keep failing trip a circuit breaker and are skipped for a
+    cool-down. With IMAGE_HEDGE_WIDTH > 1 the top providers are raced in
+    parallel first (see generate_image_hedged). Before any history exists
+    the order is:
     1. HuggingFace (FLUX/SD 2.1) - Free with token
-    2. HuggingFace Spaces - Free, no auth
-    3. DezGo - Free, no auth
-    4. Craiyon - Free, slower
-    5. Replicate/GetImg/Segmind/DeepAI - If configured
-    6. Pollinations - Free but rate limited
-    7. Placeholder - Final fallback
+    2. Prodia / Stable Horde / DezGo - Free, no auth
+    3. Craiyon - Free, slower
+    4. Replicate/GetImg/Segmind/DeepAI - If configured
+    5. Pollinations - Free but rate limited
+    6. Placeholder - Final fallback
     
     Args:
         prompt: Text description of image to generate
         output_path: Where to save the generated image
         retries: Number of retry attempts (deprecated, kept for compatibility)
+        style: Image style, part of the cache key
+        use_cache: False skips the cache both ways - for a fresh variation of
+            a prompt whose cached image another scene already uses
     
     Returns:
         str: Path to generated image file
@@ -553,43 +805,157 @@ def generate_image(prompt: str, output_path: str, retries: int = 4):
     print(f"Generating image: {prompt[:80]}...")
     print(f"{'='*60}")
     
-    # Try APIs in priority order
-    generators = [
-        # Top tier: Free, reliable, good quality
-        generate_image_hf,                    # FLUX.1-schnell, SD 2.1 (NEW ENDPOINT)
-        generate_image_hf_spaces,             # FLUX via Spaces (NEW ENDPOINT)
-        generate_image_prodia,                # Free, no key, reliable
-        generate_image_stablehorde,           # Free, community-powered
-        generate_image_dezgo,                 # Free, no key
-        generate_image_craiyon,               # Free, slower but reliable
-        
-        # Paid/Limited APIs (if configured)
-        generate_image_replicate,
-        generate_image_getimg,
-        generate_image_segmind,
-        generate_image_deepai,
-        
-        # Last resort free option (rate limited)
-        generate_image_pollinations_smart,
-    ]
-    
-    for generator in generators:
+    if use_cache:
         try:
-            result = generator(prompt, output_path)
-            if result:
-                return result
+            cached = await asyncio.to_thread(image_cache.lookup, prompt, output_path, style)
+            if cached:
+                return cached
         except Exception as e:
-            print(f"{generator.__name__} failed: {e}")
-            continue
+            print(f"Image cache lookup failed: {e}")
+    
+    result = await _generate_from_providers(prompt, output_path)
+    if result:
+        if use_cache:
+            try:
+                await asyncio.to_thread(image_cache.store, prompt, result, style)
+            except Exception as e:
+                print(f"Image cache store failed: {e}")
+        return result
     
-    # Final fallback - placeholder
+    # Final fallback - placeholder (never cached)
     print("\n⚠️  All generation methods failed. Creating placeholder...")
-    return create_placeholder_image(prompt, output_path)
+    return await asyncio.to_thread(create_placeholder_image, prompt, output_path, style or "default")
+
+
+async def _generate_from_providers(prompt: str, output_path: str) -> Optional[str]:
+    """Walk (or hedge) the ranked provider chain; None if every provider failed."""
+    providers = get_ranked_providers()
+    
+    async with make_async_client() as client:
+        if settings.IMAGE_HEDGE_WIDTH > 1:
+            result, raced = await generate_image_hedged(client, prompt, output_path, providers)
+            if result:
+                return result
+            # Everything raced has failed - walk the rest of the chain normally
+            providers = [entry for entry in providers if entry[0] not in raced]
+        
+        for key, generator, _, _ in providers:
+            result = await _run_provider(client, key, generator, prompt, output_path)
+            if result:
+                return result
+    
+    return None
+
+
+# Providers that return several images for one prompt in a single request
+BATCH_PROVIDERS = {
+    "replicate": generate_images_replicate,
+    "stablehorde": generate_images_stablehorde,
+    "segmind": generate_images_segmind,
+}
+
+
+async def _generate_batch(prompt: str, output_paths: list[str]) -> list[str]:
+    """Fill as many output_paths as possible with batched calls to batch-capable providers."""
+    remaining = list(output_paths)
+    saved = []
+    
+    async with make_async_client() as client:
+        for key, _, _, _ in get_ranked_providers():
+            if not remaining:
+                break
+            batch_fn = BATCH_PROVIDERS.get(key)
+            if batch_fn is None:
+                continue
+            
+            while remaining:
+                chunk = remaining[:BATCH_LIMITS[key]]
+                started = time.monotonic()
+                try:
+                    done = await batch_fn(client, prompt, chunk)
+                except Exception as e:
+                    print(f"{batch_fn.__name__} failed: {e}")
+                    done = []
+                
+                if done:
+                    scoreboard.record_success(key, time.monotonic() - started)
+                    saved.extend(done)
+                    remaining = [p for p in remaining if p not in done]
+                else:
+                    scoreboard.record_failure(key, time.monotonic() - started)
+                    break  # Next provider
+    
+    return saved
+
+
+async def generate_images(
+    prompts: list[str],
+    output_paths: list[str],
+    style: str = "",
+    on_ready: Optional[Callable[[int], None]] = None,
+) -> list[str]:
+    """
+    Generate the images for a whole job.
+    
+    Prompts that normalize to the same cache key are grouped: the group is
+    sent as one batched request (Replicate num_outputs, Stable Horde n,
+    Segmind samples) so each scene still gets its own variation without
+    paying one queue wait per image. A cached image covers one scene of the
+    group and the batch the rest. Other prompts go through generate_image
+    concurrently, and so does anything a batch could not fill - bypassing
+    the cache, which would hand every such scene the same image.
+    
+    on_ready(i) is called as soon as image i is written, so callers can
+    start on a scene without waiting for the slowest provider.
+    
+    Returns:
+        list[str]: Image paths in the same order as prompts
+    """
+    if len(prompts) != len(output_paths):
+        raise ValueError("prompts and output_paths must have the same length")
+    
+    groups: dict[str, list[int]] = {}
+    for i, prompt in enumerate(prompts):
+        groups.setdefault(image_cache.make_key(prompt, style), []).append(i)
+    
+    async def run_group(indices: list[int]):
+        remaining = indices
+        if len(indices) > 1:
+            prompt = prompts[indices[0]]
+            paths = [output_paths[i] for i in indices]
+            
+            cached = await asyncio.to_thread(image_cache.lookup, prompt, paths[0], style)
+            done = [cached] if cached else []
+            batch_paths = paths[len(done):]
+            if len(batch_paths) > 1 or not done:
+                print(f"Batching {len(batch_paths)} scenes with the same prompt: {prompt[:60]}...")
+                batch = await _generate_batch(prompt, batch_paths)
+                if batch and not cached:
+                    await asyncio.to_thread(image_cache.store, prompt, batch[0], style)
+                done += batch
+            remaining = [i for i in indices if output_paths[i] not in done]
+            if on_ready:
+                for i in indices:
+                    if i not in remaining:
+                        on_ready(i)
+        
+        # Group members left over need their own variation, not the cached image
+        fresh = len(indices) > 1
+        
+        async def run_one(i: int):
+            await generate_image(prompts[i], output_paths[i], style=style, use_cache=not fresh)
+            if on_ready:
+                on_ready(i)
+        
+        await asyncio.gather(*(run_one(i) for i in remaining))
+    
+    await asyncio.gather(*(run_group(indices) for indices in groups.values()))
+    return list(output_paths)
 
 
 # Test function
 if __name__ == "__main__":
     test_prompt = "A beautiful sunset over mountains, cinematic, high quality"
     output = "test_output.jpg"
-    result = generate_image(test_prompt, output)
-    print(f"\n✓ Final result: {result}")
\ No newline at end of file
+    result = asyncio.run(generate_image(test_prompt, output))
+    print(f"\n✓ Final result: {result}")
@@ -0,0 +1,40 @@
+# HTTP Client Factory for ReelAgent
+# Every outbound image-provider request goes through a client built here.
+#
+# When IMAGE_API_OVERRIDE is set (e.g. "http://127.0.0.1:8765"), requests are
+# rerouted to that base URL with the original host kept as the first path
+# segment: https://api.prodia.com/v1/job -> http://127.0.0.1:8765/api.prodia.com/v1/job
+# This lets mock_providers.py stand in for every live service offline.
+
+import httpx
+
+from core.config import settings
+
+
+class _OverrideTransport(httpx.AsyncBaseTransport):
+    def __init__(self, base_url: str):
+        self.base = httpx.URL(base_url)
+        self._transport = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        if (url.host, url.port) != (self.base.host, self.base.port):
+            request.url = url.copy_with(
+                scheme=self.base.scheme,
+                host=self.base.host,
+                port=self.base.port,
+                path=f"/{url.host}{url.path}",
+            )
+            request.headers["Host"] = request.url.netloc.decode("ascii")
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def make_async_client(**kwargs) -> httpx.AsyncClient:
+    """httpx.AsyncClient for provider calls (honours IMAGE_API_OVERRIDE)."""
+    kwargs.setdefault("follow_redirects", True)
+    if settings.IMAGE_API_OVERRIDE:
+        kwargs["transport"] = _OverrideTransport(settings.IMAGE_API_OVERRIDE)
+    return httpx.AsyncClient(**kwargs)
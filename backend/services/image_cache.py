@@ -0,0 +1,111 @@
+# Image Cache for ReelAgent
+# Content-addressed store of generated images, consulted before any provider.
+#
+# Keys are built from the normalized prompt text, the image style and the
+# target size. Entries live under DATA_DIR/image_cache (services.file_store);
+# the least recently used files are evicted once IMAGE_CACHE_MAX_MB is
+# exceeded. Optionally, a prompt whose token set is close enough to a cached
+# one (Jaccard >= IMAGE_CACHE_NEAR_DUP_THRESHOLD) reuses that image too.
+
+import hashlib
+import os
+import re
+from typing import Optional
+
+from core.config import settings
+from services.file_store import LRUFileStore
+
+# Words that don't change what gets drawn
+STOP_WORDS = {
+    "a", "an", "the", "of", "and", "in", "on", "with", "at", "to", "for",
+    "is", "are", "by", "very", "high", "quality",
+}
+
+
+def normalize_prompt(prompt: str) -> list[str]:
+    """Lowercase, strip punctuation and filler words; keeps word order."""
+    words = re.findall(r"[a-z0-9]+", prompt.lower())
+    return [w for w in words if w not in STOP_WORDS]
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ImageCache(LRUFileStore):
+    def __init__(self, cache_dir: str, max_bytes: int, near_dup_threshold: float = 0.0):
+        super().__init__(cache_dir, max_bytes)
+        self.near_dup_threshold = near_dup_threshold
+
+    # ----------------------------
+    # Keys
+    # ----------------------------
+    @staticmethod
+    def make_key(prompt: str, style: str = "", size: tuple[int, int] = (1080, 1920)) -> str:
+        normalized = " ".join(normalize_prompt(prompt))
+        raw = f"{normalized}|{style.strip().lower()}|{size[0]}x{size[1]}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _find_near_dup(self, prompt: str, style: str, size: tuple[int, int]) -> Optional[str]:
+        tokens = set(normalize_prompt(prompt))
+        style_norm = style.strip().lower()
+        best_key, best_score = None, self.near_dup_threshold
+        for other_key, entry in self._entries():
+            if entry["style"] != style_norm or tuple(entry["size"]) != tuple(size):
+                continue
+            score = _jaccard(tokens, set(entry["tokens"]))
+            if score >= best_score:
+                best_key, best_score = other_key, score
+        return best_key
+
+    # ----------------------------
+    # Public API (blocking - call via asyncio.to_thread)
+    # ----------------------------
+    def lookup(
+        self,
+        prompt: str,
+        output_path: str,
+        style: str = "",
+        size: tuple[int, int] = (1080, 1920),
+    ) -> Optional[str]:
+        """Copy a cached image for this prompt to output_path; None on a miss."""
+        if self.max_bytes <= 0:
+            return None
+
+        result = self._get(self.make_key(prompt, style, size), output_path)
+        if result is None and self.near_dup_threshold > 0:
+            near_key = self._find_near_dup(prompt, style, size)
+            if near_key is not None:
+                result = self._get(near_key, output_path)
+
+        if result:
+            print(f"✓ Image cache hit: {output_path}")
+        return result
+
+    def store(
+        self,
+        prompt: str,
+        image_path: str,
+        style: str = "",
+        size: tuple[int, int] = (1080, 1920),
+    ):
+        """Add a freshly generated image to the cache, evicting LRU entries if needed."""
+        key = self.make_key(prompt, style, size)
+        ext = os.path.splitext(image_path)[1] or ".img"
+        self._put(
+            key,
+            image_path,
+            f"{key}{ext}",
+            tokens=sorted(set(normalize_prompt(prompt))),
+            style=style.strip().lower(),
+            size=list(size),
+        )
+
+
+image_cache = ImageCache(
+    cache_dir=os.path.join(settings.DATA_DIR, "image_cache"),
+    max_bytes=settings.IMAGE_CACHE_MAX_MB * 1024 * 1024,
+    near_dup_threshold=settings.IMAGE_CACHE_NEAR_DUP_THRESHOLD,
+)
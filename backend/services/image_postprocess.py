@@ -0,0 +1,116 @@
+# Image Post-Processing for ReelAgent
+# One shared stage that turns raw provider bytes into the final scene image.
+#
+# - Validates the payload (decodable image, sane dimensions) so a provider
+#   that answers 200 with an error page counts as a failure.
+# - JPEG sources use draft mode, letting libjpeg decode at 1/2, 1/4 or 1/8
+#   scale instead of decoding full resolution just to shrink it again.
+# - Crops to the target aspect ratio and reduces+resizes in a single
+#   Image.resize call (box + reducing_gap) - no stretching, one pass.
+# - Writes one consistent format picked from the output extension
+#   (high-quality JPEG by default, WebP supported, PNG kept for compatibility).
+
+import os
+from io import BytesIO
+
+from PIL import Image
+
+from core.config import settings
+
+TARGET_SIZE = (1080, 1920)
+
+# Smallest provider output we accept (anything below is an error page/thumbnail)
+MIN_SOURCE_SIDE = 256
+MIN_SOURCE_BYTES = 1000
+
+_FORMATS = {
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".webp": "WEBP",
+    ".png": "PNG",
+}
+
+
+class InvalidImageError(ValueError):
+    """Provider payload is not a usable image."""
+
+
+def output_format(output_path: str) -> str:
+    return _FORMATS.get(os.path.splitext(output_path)[1].lower(), "JPEG")
+
+
+def _crop_box(size: tuple[int, int], target: tuple[int, int]) -> tuple[int, int, int, int]:
+    """Centered box in `size` with the aspect ratio of `target`."""
+    width, height = size
+    target_ratio = target[0] / target[1]
+    if width / height > target_ratio:
+        crop_w = round(height * target_ratio)
+        left = (width - crop_w) // 2
+        return (left, 0, left + crop_w, height)
+    crop_h = round(width / target_ratio)
+    top = (height - crop_h) // 2
+    return (0, top, width, top + crop_h)
+
+
+def save_image(img: Image.Image, output_path: str):
+    """Save with the settings for the format implied by output_path."""
+    fmt = output_format(output_path)
+    if fmt == "JPEG":
+        img.save(output_path, "JPEG", quality=settings.IMAGE_QUALITY, optimize=True)
+    elif fmt == "WEBP":
+        img.save(output_path, "WEBP", quality=settings.IMAGE_QUALITY, method=4)
+    else:
+        img.save(output_path, "PNG", compress_level=3)
+
+
+def finalize_image(content: bytes, output_path: str, target_size: tuple[int, int] = TARGET_SIZE) -> str:
+    """
+    Validate, decode, fit and save provider output in one pass.
+
+    CPU-bound - call via asyncio.to_thread from async code.
+
+    Raises:
+        InvalidImageError: payload is not an image or is too small.
+    """
+    if not content or len(content) < MIN_SOURCE_BYTES:
+        raise InvalidImageError(f"Image payload too small ({len(content or b'')} bytes)")
+
+    try:
+        img = Image.open(BytesIO(content))
+        source_format = img.format
+        source_size = img.size
+    except Exception as e:
+        raise InvalidImageError(f"Undecodable image payload: {e}") from e
+
+    if min(source_size) < MIN_SOURCE_SIDE:
+        raise InvalidImageError(f"Image too small: {source_size[0]}x{source_size[1]}")
+
+    fmt = output_format(output_path)
+
+    # Already exactly what we want - keep the provider's bytes untouched
+    if source_size == target_size and source_format == fmt:
+        with open(output_path, "wb") as f:
+            f.write(content)
+        return output_path
+
+    box = _crop_box(source_size, target_size)
+
+    if source_format == "JPEG":
+        # Decode straight at the smallest DCT scale still >= the crop we need
+        crop_w, crop_h = box[2] - box[0], box[3] - box[1]
+        scale = min(crop_w / target_size[0], crop_h / target_size[1])
+        if scale > 1:
+            img.draft("RGB", (int(source_size[0] / scale), int(source_size[1] / scale)))
+            if img.size != source_size:
+                sx = img.size[0] / source_size[0]
+                sy = img.size[1] / source_size[1]
+                box = (box[0] * sx, box[1] * sy, box[2] * sx, box[3] * sy)
+
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    if img.size != target_size or box != (0, 0, img.size[0], img.size[1]):
+        img = img.resize(target_size, Image.Resampling.LANCZOS, box=box, reducing_gap=2.0)
+
+    save_image(img, output_path)
+    return output_path
@@ -0,0 +1,173 @@
+# Remote Job Poller for ReelAgent
+# One background task polls every outstanding remote generation job
+# (Prodia, Stable Horde, ...) instead of one sleeping loop per image.
+#
+# Providers submit their job, then `await poller.wait(...)` with a small
+# check coroutine. The poller polls all due jobs together each tick (capped
+# at POLL_BATCH_SIZE concurrent checks), backs off per job while it stays
+# pending, and resolves the waiting future once the check reports a result.
+
+import asyncio
+import itertools
+import random
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+
+from services.http_client import make_async_client
+
+# Poll cadence per job: start at BASE, grow by BACKOFF while pending, cap at MAX
+POLL_BASE_INTERVAL = 2.0
+POLL_BACKOFF = 1.5
+POLL_MAX_INTERVAL = 10.0
+
+# Max status requests in flight per tick
+POLL_BATCH_SIZE = 16
+
+
+class Pending:
+    """Returned by a check coroutine while the remote job is still running."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        # Provider hint (e.g. Stable Horde's wait_time) for the next poll
+        self.retry_after = retry_after
+
+
+PENDING = Pending()
+
+CheckFn = Callable[[httpx.AsyncClient], Awaitable[Any]]
+
+
+@dataclass
+class _TrackedJob:
+    name: str
+    check: CheckFn
+    future: asyncio.Future
+    deadline: float
+    next_poll: float
+    interval: float = POLL_BASE_INTERVAL
+    polls: int = field(default=0)
+
+
+class RemoteJobPoller:
+    def __init__(self, batch_size: int = POLL_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._jobs: dict[int, _TrackedJob] = {}
+        self._ids = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._jobs)
+
+    async def wait(self, name: str, check: CheckFn, timeout: float) -> Any:
+        """
+        Track a submitted remote job until `check` returns something other
+        than a Pending instance, and return that value.
+
+        `check(client)` may raise to fail the job. Raises asyncio.TimeoutError
+        if the job is still pending after `timeout` seconds. Cancelling the
+        caller drops the job from the poller.
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        job_key = next(self._ids)
+        job = _TrackedJob(
+            name=name,
+            check=check,
+            future=loop.create_future(),
+            deadline=now + timeout,
+            interval=POLL_BASE_INTERVAL,
+            # Small jitter so jobs submitted together don't poll in lockstep
+            next_poll=now + POLL_BASE_INTERVAL + random.uniform(0, 0.5),
+        )
+        self._jobs[job_key] = job
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+        try:
+            # The deadline holds even if no poll ever runs for this job
+            return await asyncio.wait_for(job.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"{name} still pending after {timeout}s ({job.polls} polls)")
+        finally:
+            self._jobs.pop(job_key, None)
+
+    async def _poll(self, client: httpx.AsyncClient, job: _TrackedJob):
+        job.polls += 1
+        try:
+            result = await job.check(client)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+
+        if job.future.done():
+            return
+
+        if isinstance(result, Pending):
+            now = time.monotonic()
+            if now >= job.deadline:
+                job.future.set_exception(asyncio.TimeoutError(
+                    f"{job.name} still pending after {job.polls} polls"
+                ))
+                return
+            job.interval = min(job.interval * POLL_BACKOFF, POLL_MAX_INTERVAL)
+            delay = result.retry_after if result.retry_after else job.interval
+            job.next_poll = min(now + max(delay, POLL_BASE_INTERVAL), job.deadline)
+        else:
+            job.future.set_result(result)
+
+    def _has_live_jobs(self) -> bool:
+        return any(not j.future.done() for j in self._jobs.values())
+
+    async def _run(self):
+        """Single polling loop; exits (and closes its client) when nothing is pending."""
+        while True:
+            async with make_async_client(timeout=10) as client:
+                await self._poll_until_idle(client)
+            # A job registered while the client was closing saw this task
+            # still running and started no loop of its own - keep going
+            if not self._has_live_jobs():
+                return
+
+    async def _poll_until_idle(self, client: httpx.AsyncClient):
+        while True:
+            live = [j for j in self._jobs.values() if not j.future.done()]
+            if not live:
+                return
+
+            now = time.monotonic()
+            due = sorted(
+                (j for j in live if j.next_poll <= now),
+                key=lambda j: j.next_poll,
+            )[:self.batch_size]
+
+            if not due:
+                self._wakeup.clear()
+                sleep_for = min(j.next_poll for j in live) - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await asyncio.gather(*(self._poll(client, j) for j in due))
+
+
+_pollers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RemoteJobPoller]" = weakref.WeakKeyDictionary()
+
+
+def get_poller() -> RemoteJobPoller:
+    """The shared poller for the running event loop."""
+    loop = asyncio.get_running_loop()
+    poller = _pollers.get(loop)
+    if poller is None:
+        poller = _pollers[loop] = RemoteJobPoller()
+    return poller
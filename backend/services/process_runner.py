@@ -0,0 +1,104 @@
+# Streaming Subprocess Runner for ReelAgent
+# Runs a long external command (Remotion CLI, ...) without buffering its
+# whole output and without leaking it on timeout.
+#
+# - stdout/stderr are read incrementally and handed to a callback line by
+#   line (\r-terminated progress updates count as lines too)
+# - only the last OUTPUT_TAIL_LINES lines are kept for error reports
+# - the child gets its own process group; on timeout or cancellation the
+#   whole group (npx -> node -> browser/ffmpeg) is killed, not just npx
+
+import asyncio
+import os
+import re
+import signal
+from collections import deque
+from typing import Callable, Optional
+
+OUTPUT_TAIL_LINES = 200
+READ_CHUNK = 64 * 1024
+
+_LINE_BREAK = re.compile(r"[\r\n]")
+
+
+class ProcessTimeout(Exception):
+    def __init__(self, timeout: float, tail: list[str]):
+        super().__init__(f"Process timed out after {timeout}s")
+        self.timeout = timeout
+        self.tail = tail
+
+
+def _kill_group(process: asyncio.subprocess.Process):
+    try:
+        if os.name == "nt":
+            if process.returncode is None:
+                process.kill()
+        else:
+            # The group outlives its leader: signal it even once npx has exited
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _pump(stream: asyncio.StreamReader, name: str, tail: deque, on_line: Optional[Callable[[str, str], None]]):
+    pending = ""
+    while True:
+        chunk = await stream.read(READ_CHUNK)
+        if not chunk:
+            break
+        parts = _LINE_BREAK.split(pending + chunk.decode("utf-8", errors="replace"))
+        pending = parts.pop()
+        for line in parts:
+            if line.strip():
+                tail.append(line)
+                if on_line:
+                    on_line(name, line)
+    if pending.strip():
+        tail.append(pending)
+        if on_line:
+            on_line(name, pending)
+
+
+async def run_streaming(
+    cmd: list[str],
+    cwd: Optional[str] = None,
+    timeout: float = 600,
+    on_line: Optional[Callable[[str, str], None]] = None,
+) -> tuple[int, list[str]]:
+    """
+    Run cmd, streaming output lines to on_line(stream_name, line).
+
+    Returns (returncode, last output lines). Raises ProcessTimeout after
+    `timeout` seconds; on timeout or cancellation the process group is killed.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=(os.name != "nt"),
+    )
+    tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+
+    async def run():
+        await asyncio.gather(
+            _pump(process.stdout, "stdout", tail, on_line),
+            _pump(process.stderr, "stderr", tail, on_line),
+        )
+        return await process.wait()
+
+    try:
+        returncode = await asyncio.wait_for(run(), timeout=timeout)
+    except asyncio.TimeoutError:
+        _kill_group(process)
+        await process.wait()
+        raise ProcessTimeout(timeout, list(tail))
+    except asyncio.CancelledError:
+        _kill_group(process)
+        await process.wait()
+        raise
+    finally:
+        # Grandchildren (browser, ffmpeg) may outlive a finished npx
+        _kill_group(process)
+
+    return returncode, list(tail)
@@ -0,0 +1,149 @@
+# Provider Health Scoreboard for ReelAgent
+# Tracks success rate and latency per image provider/model, trips circuit
+# breakers on repeated failures and ranks providers by expected time-to-image.
+#
+# A single module-level `scoreboard` is shared by every job (generate_image
+# runs in worker threads, so all state is guarded by a lock).
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from core.config import settings
+
+# Weight of the newest sample in the latency moving average
+LATENCY_EWMA_ALPHA = 0.3
+
+# Cool-down never grows beyond this, however often a breaker re-trips (seconds)
+MAX_BREAKER_COOLDOWN = 3600
+
+
+class ProviderSkipped(Exception):
+    """A provider made no attempt at all (e.g. every model paused) - not a failure."""
+
+
+@dataclass
+class ProviderStats:
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    avg_latency: Optional[float] = None  # EWMA over all attempts (seconds)
+    open_until: float = 0.0              # Breaker open while time.monotonic() < open_until
+    trips: int = 0                       # Consecutive breaker trips (drives back-off)
+
+    @property
+    def attempts(self) -> int:
+        return self.successes + self.failures
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace-smoothed so a fresh provider starts at 50%, not 0% or 100%
+        return (self.successes + 1) / (self.attempts + 2)
+
+
+class ProviderScoreboard:
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 300,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._stats: dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> ProviderStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = ProviderStats()
+        return stats
+
+    def _update_latency(self, stats: ProviderStats, latency: float):
+        if stats.avg_latency is None:
+            stats.avg_latency = latency
+        else:
+            stats.avg_latency += LATENCY_EWMA_ALPHA * (latency - stats.avg_latency)
+
+    def record_success(self, key: str, latency: float):
+        with self._lock:
+            stats = self._get(key)
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            stats.trips = 0
+            stats.open_until = 0.0
+            self._update_latency(stats, latency)
+
+    def record_failure(self, key: str, latency: float, cooldown: Optional[float] = None):
+        """
+        Record a failed attempt.
+
+        The breaker opens once `failure_threshold` consecutive failures pile up
+        (each re-trip doubles the cool-down), or immediately when the caller
+        passes an explicit `cooldown` (e.g. a 503 with a known warm-up time).
+        """
+        with self._lock:
+            stats = self._get(key)
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            self._update_latency(stats, latency)
+
+            if cooldown is not None:
+                stats.open_until = time.monotonic() + cooldown
+                print(f"[HEALTH] {key} paused for {cooldown:.0f}s")
+            elif stats.consecutive_failures >= self.failure_threshold:
+                backoff = min(self.cooldown_seconds * (2 ** stats.trips), MAX_BREAKER_COOLDOWN)
+                stats.open_until = time.monotonic() + backoff
+                stats.trips += 1
+                # Half-open after the cool-down: one more failure re-trips
+                stats.consecutive_failures = self.failure_threshold - 1
+                print(f"[HEALTH] Circuit open for {key} ({backoff:.0f}s)")
+
+    def is_available(self, key: str) -> bool:
+        with self._lock:
+            stats = self._stats.get(key)
+            return stats is None or time.monotonic() >= stats.open_until
+
+    def expected_time_to_image(self, key: str, prior_latency: float) -> float:
+        """
+        Expected seconds spent on this provider per successful image
+        (latency / success probability). Unseen providers use `prior_latency`.
+        """
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                return prior_latency / 0.5
+            latency = stats.avg_latency if stats.avg_latency is not None else prior_latency
+            return latency / stats.success_rate
+
+    def rank(self, candidates: Iterable[tuple[str, float]]) -> list[str]:
+        """
+        Order (key, prior_latency) candidates by expected time-to-image,
+        dropping providers whose breaker is open. Ties keep the given order.
+        """
+        candidates = list(candidates)
+        available = [(k, p) for k, p in candidates if self.is_available(k)]
+        order = {k: i for i, (k, _) in enumerate(candidates)}
+        available.sort(key=lambda kp: (self.expected_time_to_image(kp[0], kp[1]), order[kp[0]]))
+        return [k for k, _ in available]
+
+    def snapshot(self) -> dict:
+        """Plain-dict view of the scoreboard (for logs / debugging endpoints)."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: {
+                    "successes": s.successes,
+                    "failures": s.failures,
+                    "success_rate": round(s.success_rate, 3),
+                    "avg_latency": round(s.avg_latency, 2) if s.avg_latency is not None else None,
+                    "circuit_open_for": max(0.0, round(s.open_until - now, 1)),
+                }
+                for key, s in self._stats.items()
+            }
+
+
+scoreboard = ProviderScoreboard(
+    failure_threshold=settings.IMAGE_BREAKER_THRESHOLD,
+    cooldown_seconds=settings.IMAGE_BREAKER_COOLDOWN,
+)
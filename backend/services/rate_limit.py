@@ -0,0 +1,90 @@
+# Rate Limiting for ReelAgent
+# Per-provider token buckets shared by every scene and every job.
+#
+# Replaces the old global Semaphore(1) around image generation: requests to a
+# provider are only throttled against that provider's own quota, so different
+# providers (and different scenes) run in parallel.
+
+import asyncio
+import threading
+import time
+
+from core.config import settings
+
+# Default quotas: provider -> (requests per minute, burst size)
+# Override the rate per provider with IMAGE_RATE_LIMITS in .env
+DEFAULT_RATE_LIMITS = {
+    "huggingface": (30, 4),
+    "prodia": (20, 3),
+    "stablehorde": (10, 2),
+    "dezgo": (10, 2),
+    "craiyon": (4, 1),
+    "replicate": (60, 6),
+    "getimg": (30, 3),
+    "segmind": (30, 3),
+    "deepai": (10, 2),
+    "pollinations": (6, 1),   # Strict anonymous limits - spread requests out
+}
+
+FALLBACK_RATE_LIMIT = (30, 2)
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out future slots instead of locking.
+
+    acquire() reserves a token immediately (the balance may go negative) and
+    then sleeps until that token would have refilled. No asyncio primitives
+    are held, so one bucket is safe to share across event loops and threads.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token; return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def _refund(self):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    async def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._refund()  # Cancelled before using the slot
+                raise
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider: str) -> TokenBucket:
+    """Shared bucket for a provider, created on first use."""
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            rate, burst = DEFAULT_RATE_LIMITS.get(provider, FALLBACK_RATE_LIMIT)
+            rate = settings.IMAGE_RATE_LIMITS.get(provider, rate)
+            bucket = _buckets[provider] = TokenBucket(rate, burst)
+        return bucket
+
+
+async def acquire(provider: str):
+    """Wait for a request slot on the given provider's quota."""
+    await get_bucket(provider).acquire()
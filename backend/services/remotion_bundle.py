@@ -0,0 +1,151 @@
+# Remotion Bundle Cache for ReelAgent
+# Builds the Remotion webpack bundle once per version of the template sources
+# instead of re-bundling src/remotion/index.ts on every render.
+#
+# The version is a hash of frontend/src/remotion/** plus package-lock.json.
+# Bundles live in frontend/.bundle-cache/<hash>/; a build goes to a temp dir
+# first and is renamed into place, so a render never sees a half-written
+# bundle. When sources change the next request builds the new hash while
+# renders already running keep their old bundle (the last few are retained).
+#
+# A dist-bundle/ (the Docker image's pre-built bundle) is used only while
+# the hash stamped next to it (dist-bundle.hash, written by the Dockerfile
+# via stamp_prebuilt) matches the current sources - a stale local or dev
+# build falls through to the hash-keyed cache instead of serving old
+# compositions.
+
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+from services.process_runner import ProcessTimeout, run_streaming
+
+CACHE_DIRNAME = ".bundle-cache"
+PREBUILT_DIRNAME = "dist-bundle"
+PREBUILT_STAMP = "dist-bundle.hash"
+KEEP_BUNDLES = 3
+BUILD_TIMEOUT = 600
+RETRY_FAILED_AFTER = 300  # Don't re-run a failing build on every render
+
+
+def source_hash(frontend_dir: str) -> str:
+    """Version of the Remotion sources: hash of every file path + content."""
+    digest = hashlib.sha256()
+    source_root = os.path.join(frontend_dir, "src", "remotion")
+    files = []
+    for root, _, names in os.walk(source_root):
+        files.extend(os.path.join(root, name) for name in names)
+    lockfile = os.path.join(frontend_dir, "package-lock.json")
+    if os.path.exists(lockfile):
+        files.append(lockfile)
+
+    for path in sorted(files):
+        digest.update(os.path.relpath(path, frontend_dir).replace(os.sep, "/").encode("utf-8"))
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def stamp_prebuilt(frontend_dir: str):
+    """Record which sources frontend/dist-bundle was built from (run right after building it)."""
+    with open(os.path.join(frontend_dir, PREBUILT_STAMP), "w", encoding="utf-8") as f:
+        f.write(source_hash(frontend_dir))
+
+
+class BundleManager:
+    def __init__(self, frontend_dir: str):
+        self.frontend_dir = os.path.abspath(frontend_dir)
+        self.cache_dir = os.path.join(self.frontend_dir, CACHE_DIRNAME)
+        self._builds: dict[str, asyncio.Task] = {}
+        self._failed: dict[str, float] = {}
+
+    def _prebuilt(self, version: str) -> Optional[str]:
+        path = os.path.join(self.frontend_dir, PREBUILT_DIRNAME)
+        try:
+            with open(os.path.join(self.frontend_dir, PREBUILT_STAMP), "r", encoding="utf-8") as f:
+                stamp = f.read().strip()
+        except OSError:
+            return None
+        return path if stamp == version and os.path.isdir(path) else None
+
+    async def get_bundle(self) -> Optional[str]:
+        """
+        Path of a bundle matching the current sources, building it if needed
+        (concurrent callers share one build). None if bundling failed - the
+        caller then bundles at render time as before.
+        """
+        version = await asyncio.to_thread(source_hash, self.frontend_dir)
+        prebuilt = self._prebuilt(version)
+        if prebuilt:
+            return prebuilt
+
+        path = os.path.join(self.cache_dir, version)
+        if os.path.isdir(path):
+            return path
+        if time.monotonic() - self._failed.get(version, float("-inf")) < RETRY_FAILED_AFTER:
+            return None
+
+        task = self._builds.get(version)
+        if task is None or task.done():
+            task = self._builds[version] = asyncio.create_task(self._build(version))
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._builds.pop(version, None)
+
+    async def _build(self, version: str) -> Optional[str]:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f"{version}.building-", dir=self.cache_dir)
+        out_dir = os.path.join(staging, "bundle")
+        final = os.path.join(self.cache_dir, version)
+
+        npx_cmd = "npx.cmd" if os.name == "nt" else "npx"
+        cmd = [npx_cmd, "--yes", "remotion", "bundle", "src/remotion/index.ts", f"--out-dir={out_dir}"]
+        print(f"[REMOTION BUNDLE] Building {version}...")
+        try:
+            returncode, tail = await run_streaming(cmd, cwd=self.frontend_dir, timeout=BUILD_TIMEOUT)
+        except ProcessTimeout:
+            returncode, tail = -1, ["bundle timed out"]
+
+        if returncode != 0:
+            shutil.rmtree(staging, ignore_errors=True)
+            print(f"[REMOTION BUNDLE] Build failed ({returncode}): " + "\n".join(tail[-10:]))
+            self._failed[version] = time.monotonic()
+            return None
+
+        try:
+            os.rename(out_dir, final)
+        except OSError:
+            pass  # Another process published the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+        print(f"[REMOTION BUNDLE] ✓ Ready: {final}")
+        await asyncio.to_thread(self._prune, version)
+        return final
+
+    def _prune(self, current: str):
+        """Drop old bundles, keeping the newest few for renders still using them."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name != current and ".building-" not in name and os.path.isdir(path):
+                entries.append((os.path.getmtime(path), path))
+        for _, path in sorted(entries, reverse=True)[KEEP_BUNDLES - 1:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+_managers: dict[str, BundleManager] = {}
+
+
+def get_bundle_manager(frontend_dir: str) -> BundleManager:
+    key = os.path.abspath(frontend_dir)
+    manager = _managers.get(key)
+    if manager is None:
+        manager = _managers[key] = BundleManager(key)
+    return manager
@@ -1,7 +1,196 @@
 import os
+import re
 import json
 import asyncio
-import subprocess
+import shutil
+
+import psutil
+
+from models import JobDB
+from services.remotion_bundle import get_bundle_manager
+from services.remotion_server import RenderServerError, get_render_server
+from services.render_cache import render_cache
+from services.ffmpeg_assembler import available_cpus, run_ffmpeg, write_concat_list
+from services.process_runner import ProcessTimeout, run_streaming
+from services.workspace import job_workspace
+
+# Chunked rendering: reels are split into frame ranges rendered in parallel
+# (muted), stream-copy concatenated, and the narration muxed once from disk.
+# A full render splits at scene boundaries and keeps the chunks next to the
+# reel (CHUNK_MANIFEST), so a scene edit re-renders only that scene's chunk.
+MIN_CHUNK_FRAMES = 300          # ~10s at 30fps - shorter renders aren't worth splitting
+CHUNK_WORKER_MEMORY_MB = 1500   # Headless browser + encoder per concurrent chunk
+RENDER_FPS = 30                 # Composition fps (frontend/src/remotion/Root.tsx)
+CHUNK_MANIFEST = "chunks.json"  # Frame ranges + render settings of the kept chunks
+
+# Render tiers: frame capture + x264 settings per machine size (see
+# benchmark_remotion_render.py). Concurrency (browser tabs capturing frames)
+# is derived separately from the CPUs and memory actually free.
+RENDER_TIERS = {
+    "small": {"imageFormat": "jpeg", "jpegQuality": 70, "x264Preset": "veryfast"},
+    "medium": {"imageFormat": "jpeg", "jpegQuality": 80, "x264Preset": "faster"},
+    "large": {"imageFormat": "jpeg", "jpegQuality": 90, "x264Preset": "medium"},
+}
+RENDER_TAB_MEMORY_MB = 300      # Per concurrent browser tab
+
+# Preview renders: a third of the size, cheapest capture and encode, one
+# browser tab and one chunk - they run next to the full render, which keeps
+# the rest of the machine. (The composition's fps is fixed for MP4 output,
+# so previews keep 30fps.)
+PREVIEW_RENDER_SETTINGS = {"scale": 1 / 3, "jpegQuality": 50, "x264Preset": "ultrafast", "concurrency": 1}
+
+
+# Remotion CLI progress lines, e.g. "Rendered 120/900" / "Encoded 120/900"
+PROGRESS_RE = re.compile(r"\b(Render|Encod)\w*\D{0,40}?(\d+)\s*/\s*(\d+)", re.IGNORECASE)
+
+# Job log granularity for render progress
+PROGRESS_LOG_STEP = 0.1
+
+
+def publish(staged_path: str, output_path: str):
+    """
+    Move a finished file into place. Never writes into an existing output:
+    it may be a render-cache hardlink, so the entry is swapped, not rewritten.
+    """
+    tmp_path = output_path + ".part"
+    shutil.move(staged_path, tmp_path)
+    os.replace(tmp_path, output_path)
+
+
+def render_tier(cpus: int, available_mb: int) -> str:
+    if cpus <= 2 or available_mb < 2048:
+        return "small"
+    if cpus <= 4 or available_mb < 6144:
+        return "medium"
+    return "large"
+
+
+def plan_render_settings(chunk_count: int = 1, tier: str = "auto", concurrency: int = 0) -> dict:
+    """
+    Remotion render options for each of chunk_count concurrent renders.
+
+    tier="auto" picks a RENDER_TIERS preset from live CPU/memory; concurrency=0
+    splits the free CPUs between chunks, capped so every tab has memory.
+    """
+    cpus = available_cpus()
+    available_mb = psutil.virtual_memory().available // (1024 * 1024)
+    if tier not in RENDER_TIERS:
+        tier = render_tier(cpus, available_mb)
+    if not concurrency:
+        per_chunk_mb = available_mb // max(1, chunk_count)
+        concurrency = max(1, min(cpus // max(1, chunk_count), per_chunk_mb // RENDER_TAB_MEMORY_MB))
+    return {"tier": tier, "concurrency": concurrency, **RENDER_TIERS[tier]}
+
+
+def cli_render_flags(render_settings: dict) -> list[str]:
+    """The same settings as `npx remotion render` flags."""
+    flags = [
+        f"--concurrency={render_settings['concurrency']}",
+        f"--image-format={render_settings['imageFormat']}",
+        f"--jpeg-quality={render_settings['jpegQuality']}",
+        f"--x264-preset={render_settings['x264Preset']}",
+    ]
+    if render_settings.get("scale"):
+        flags.append(f"--scale={render_settings['scale']:.4f}")
+    return flags
+
+
+class RenderProgress:
+    """Combines progress of one or more (chunk) renders into the job's progress + logs."""
+
+    def __init__(self, job_id: str | None, weights: list[int]):
+        self.job_id = job_id
+        self.weights = weights
+        self.fractions = [0.0] * len(weights)
+        self.logged_step = 0
+
+    def reporter(self, index: int):
+        def report(fraction: float):
+            self.fractions[index] = max(self.fractions[index], min(1.0, fraction))
+            self._update()
+        return report
+
+    def _update(self):
+        total = sum(self.weights) or 1
+        overall = sum(w * f for w, f in zip(self.weights, self.fractions)) / total
+        step = int(overall / PROGRESS_LOG_STEP)
+        if step > self.logged_step:
+            self.logged_step = step
+            if self.job_id:
+                JobDB.update(self.job_id, progress=round(overall, 2))
+                JobDB.add_log(self.job_id, f"Rendering... {overall:.0%}")
+
+
+def cli_progress_parser(report):
+    """on_line callback turning Remotion CLI output into a 0-1 fraction (render + encode stages)."""
+    stages = {"render": 0.0, "encod": 0.0}
+
+    def on_line(stream: str, line: str):
+        match = PROGRESS_RE.search(line)
+        if not match:
+            return
+        done, total = int(match.group(2)), int(match.group(3))
+        if total:
+            stages[match.group(1).lower()] = done / total
+            report((stages["render"] + stages["encod"]) / 2)
+    return on_line
+
+
+def scene_chunks(scenes: list, duration_in_frames: int) -> list[tuple[int, int]] | None:
+    """Inclusive frame range per scene; None unless the scenes' frames cover the reel exactly."""
+    frames = [scene.get("duration_frames") for scene in scenes]
+    if not frames or not all(isinstance(f, int) and f > 0 for f in frames) or sum(frames) != duration_in_frames:
+        return None
+    ranges, start = [], 0
+    for f in frames:
+        ranges.append((start, start + f - 1))
+        start += f
+    return ranges
+
+
+def chunk_dir_for(output_path: str) -> str:
+    """Rendered chunks are kept next to the reel for scene edits (like video_editor.segment_dir_for)."""
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), "chunks")
+
+
+def load_chunk_manifest(chunk_dir: str, template_id: str, duration_in_frames: int) -> dict | None:
+    """The kept chunks' manifest if every chunk file is there and it fits this reel."""
+    try:
+        with open(os.path.join(chunk_dir, CHUNK_MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("template") != template_id or manifest.get("durationInFrames") != duration_in_frames:
+        return None
+    manifest["chunks"] = [tuple(r) for r in manifest["chunks"]]
+    for i in range(len(manifest["chunks"])):
+        if not os.path.exists(os.path.join(chunk_dir, f"chunk_{i}.mp4")):
+            return None
+    return manifest
+
+
+def clear_chunk_manifest(chunk_dir: str):
+    """Mark the kept chunks stale (e.g. the reel came from the render cache instead)."""
+    try:
+        os.remove(os.path.join(chunk_dir, CHUNK_MANIFEST))
+    except OSError:
+        pass
+
+
+def plan_chunks(duration_in_frames: int, workers: int = 0) -> list[tuple[int, int]]:
+    """
+    Split [0, duration_in_frames) into inclusive frame ranges, one per worker.
+
+    workers=0 sizes the split from free CPUs and memory. Every chunk keeps at
+    least MIN_CHUNK_FRAMES, so short renders stay a single range.
+    """
+    if not workers:
+        memory_slots = psutil.virtual_memory().available // (CHUNK_WORKER_MEMORY_MB * 1024 * 1024)
+        workers = max(1, min(available_cpus(), memory_slots))
+    workers = max(1, min(workers, duration_in_frames // MIN_CHUNK_FRAMES))
+
+    bounds = [round(i * duration_in_frames / workers) for i in range(workers + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(workers)]
 
 
 class RemotionRenderer:
@@ -16,15 +205,21 @@ class RemotionRenderer:
         text: str,
         duration_in_frames: int,
         scenes: list | None = None,
+        job_id: str | None = None,
+        preview: bool = False,
     ) -> str | dict:
         """
         PRODUCTION-READY Remotion renderer with comprehensive error handling.
 
-        ✔ Captures stdout/stderr for debugging
+        ✔ Streams stdout/stderr for debugging (last lines kept for errors)
         ✔ Returns detailed error info instead of None
-        ✔ Timeout protection for low-CPU environments
-        ✔ Full command output on failure
-        
+        ✔ Timeout protection for low-CPU environments (whole process tree killed)
+        ✔ Live render progress in the job logs
+        ✔ Long reels rendered as parallel frame-range chunks
+        ✔ Narration muxed from disk - no HTTP fetch through the API server
+        ✔ Identical renders reused from the render cache
+        ✔ preview=True: fast third-size render (no job progress updates)
+
         Returns:
             str: Output path on success
             dict: {"error": "message"} on failure
@@ -33,65 +228,338 @@ class RemotionRenderer:
         from core.config import settings
 
         scenes = scenes or []
-        
+
         print("\n" + "=" * 60)
         print("REMOTION RENDER START")
         print("=" * 60)
 
-        # ----------------------------
-        # 1. Validate audio location
-        # ----------------------------
-        gen_dir = os.path.abspath(settings.GENERATED_DIR)
-        audio_abs = os.path.abspath(audio_path)
+        try:
+            # ----------------------------
+            # 1. Validate audio
+            # ----------------------------
+            # The composition renders muted and the narration is muxed in
+            # straight from disk afterwards, so nothing is fetched back
+            # through the API server (no http://127.0.0.1:{PORT} loopback).
+            audio_abs = os.path.abspath(audio_path)
+            print(f"[REMOTION] AUDIO   = {audio_abs}")
+
+            if not os.path.isfile(audio_abs):
+                error_msg = f"Audio file not found: {audio_abs}"
+                print(f"[REMOTION ERROR] {error_msg}")
+                return {"error": error_msg}
+
+            # ----------------------------
+            # 2. Write props to JSON FILE
+            # ----------------------------
+            props = {
+                "text": text,
+                "audioSrc": "",
+                "scenes": scenes,
+                "durationInFrames": duration_in_frames,
+            }
+
+            # (scene edits re-read the full render's props; a concurrent preview keeps its own)
+            props_path = os.path.join(
+                os.path.dirname(output_path),
+                "remotion_props_preview.json" if preview else "remotion_props.json",
+            )
+
+            with open(props_path, "w", encoding="utf-8") as f:
+                json.dump(props, f, ensure_ascii=False)
+
+            print(f"[REMOTION] PROPS FILE = {props_path}")
+            print(f"[REMOTION] DURATION_IN_FRAMES = {duration_in_frames}")
+
+            # ----------------------------
+            # 3. Reuse an identical earlier render
+            # ----------------------------
+            cache_key = await asyncio.to_thread(
+                render_cache.make_key, template_id, props_path, audio_abs, self.frontend_dir,
+                "preview" if preview else "",
+            )
+            if await asyncio.to_thread(render_cache.lookup, cache_key, output_path):
+                if not preview:
+                    # Chunks left from another render of this reel no longer match it
+                    clear_chunk_manifest(chunk_dir_for(output_path))
+                if job_id and not preview:
+                    JobDB.update(job_id, progress=1.0)
+                    JobDB.add_log(job_id, "Reusing identical earlier render (render cache)")
+                return output_path
+
+            # ----------------------------
+            # 4. Bundle for the current template sources (built once per hash)
+            # ----------------------------
+            serve_url = await get_bundle_manager(self.frontend_dir).get_bundle()
+            print(f"[REMOTION] BUNDLE = {serve_url or 'none (runtime bundling)'}")
+
+            # ----------------------------
+            # 5. Render (one chunk per scene, parallel workers) and mux the audio
+            # ----------------------------
+            # plan_chunks sizes the parallelism; the full render still splits
+            # at scene boundaries so each scene's chunk can be redone alone
+            parallel = plan_chunks(duration_in_frames, 1 if preview else settings.REMOTION_CHUNK_WORKERS)
+            chunks = parallel if preview else (scene_chunks(scenes, duration_in_frames) or parallel)
+            render_settings = plan_render_settings(
+                len(parallel), settings.REMOTION_RENDER_TIER, settings.REMOTION_CONCURRENCY
+            )
+            if preview:
+                render_settings.update(PREVIEW_RENDER_SETTINGS)
+            print(f"[REMOTION] RENDER SETTINGS = {render_settings} x {len(parallel)} worker(s), {len(chunks)} chunk(s)")
+            if job_id and not preview:
+                JobDB.add_log(
+                    job_id,
+                    f"Render: {render_settings['tier']} tier, {len(chunks)} chunk(s) on {len(parallel)} worker(s) x "
+                    f"{render_settings['concurrency']} tab(s), x264 {render_settings['x264Preset']}",
+                )
+
+            progress = RenderProgress(None if preview else job_id, [end - start + 1 for start, end in chunks])
+            result = await self._render_chunked(
+                template_id, output_path, audio_abs, props, props_path, duration_in_frames,
+                chunks, progress, serve_url, render_settings,
+                workers=len(parallel),
+                chunk_dir=None if preview else chunk_dir_for(output_path),
+            )
+            if not isinstance(result, dict):
+                await asyncio.to_thread(render_cache.store, cache_key, result)
+            return result
+
+        except Exception as e:
+            error_msg = f"Unexpected error: {type(e).__name__}: {str(e)}"
+            print(f"[REMOTION ERROR] {error_msg}")
+            import traceback
+            traceback.print_exc()
+            return {"error": error_msg}
+
+        finally:
+            print("=" * 60)
+            print("REMOTION RENDER END")
+            print("=" * 60 + "\n")
 
-        print(f"[REMOTION] GEN DIR = {gen_dir}")
-        print(f"[REMOTION] AUDIO   = {audio_abs}")
+    async def rerender_range(
+        self,
+        template_id: str,
+        video_path: str,
+        audio_path: str,
+        props: dict,
+        frame_range: tuple[int, int],
+        job_id: str | None = None,
+    ) -> str | dict:
+        """
+        Re-render only frame_range (one edited scene) into the existing reel
+        at video_path. Only for edits that keep the timeline - same
+        narration, same frame counts.
+
+        The full render kept its per-scene chunks (chunk_dir_for); only the
+        chunks overlapping frame_range are rendered again, with the settings
+        of the originals, and the reel is re-joined by stream copy - nothing
+        else is decoded or re-encoded. Without usable chunks (e.g. the reel
+        came from the render cache) the whole reel is rendered once, keeping
+        chunks for later edits.
+        """
+        from core.config import settings
+
+        duration_in_frames = props["durationInFrames"]
+        first, last = frame_range
+        print(f"[REMOTION] Re-rendering frames {first}-{last} of {duration_in_frames}")
+
+        try:
+            audio_abs = os.path.abspath(audio_path)
+            props_path = os.path.join(os.path.dirname(video_path), "remotion_props.json")
+            with open(props_path, "w", encoding="utf-8") as f:
+                json.dump(props, f, ensure_ascii=False)
+
+            chunk_dir = chunk_dir_for(video_path)
+            cache_key = await asyncio.to_thread(
+                render_cache.make_key, template_id, props_path, audio_abs, self.frontend_dir
+            )
+            if await asyncio.to_thread(render_cache.lookup, cache_key, video_path):
+                clear_chunk_manifest(chunk_dir)
+                if job_id:
+                    JobDB.add_log(job_id, "Reusing identical earlier render (render cache)")
+                return video_path
+
+            serve_url = await get_bundle_manager(self.frontend_dir).get_bundle()
+            parallel = plan_chunks(duration_in_frames, settings.REMOTION_CHUNK_WORKERS)
+            manifest = load_chunk_manifest(chunk_dir, template_id, duration_in_frames)
+            if manifest:
+                chunks = manifest["chunks"]
+                render_settings = manifest["renderSettings"]
+                only = [i for i, (start, end) in enumerate(chunks) if start <= last and end >= first]
+            else:
+                print("[REMOTION] No kept chunks for this reel - rendering all of it")
+                if job_id:
+                    JobDB.add_log(job_id, "No kept chunks for this reel, rendering all of it...")
+                chunks = scene_chunks(props["scenes"], duration_in_frames) or parallel
+                render_settings = plan_render_settings(
+                    len(parallel), settings.REMOTION_RENDER_TIER, settings.REMOTION_CONCURRENCY
+                )
+                only = None
+
+            todo = range(len(chunks)) if only is None else only
+            progress = RenderProgress(job_id, [chunks[i][1] - chunks[i][0] + 1 for i in todo])
+            result = await self._render_chunked(
+                template_id, video_path, audio_abs, props, props_path, duration_in_frames,
+                chunks, progress, serve_url, render_settings,
+                workers=len(parallel),
+                chunk_dir=chunk_dir,
+                only=only,
+            )
+            if isinstance(result, dict):
+                return result
 
-        if not audio_abs.startswith(gen_dir):
-            error_msg = "Audio must be inside GENERATED_DIR"
+            await asyncio.to_thread(render_cache.store, cache_key, video_path)
+            print(f"[REMOTION] ✓ Scene re-render spliced: {video_path}")
+            return video_path
+
+        except Exception as e:
+            error_msg = f"Unexpected error: {type(e).__name__}: {str(e)}"
             print(f"[REMOTION ERROR] {error_msg}")
             return {"error": error_msg}
 
-        rel_path = audio_abs[len(gen_dir):].lstrip("\\/")
-        port = os.environ.get("PORT", "8000")
-        audio_url = (
-            f"http://127.0.0.1:{port}/generated/"
-            + rel_path.replace(os.sep, "/")
-        )
+    async def _render_chunked(
+        self,
+        template_id: str,
+        output_path: str,
+        audio_abs: str,
+        props: dict,
+        props_path: str,
+        duration_in_frames: int,
+        chunks: list[tuple[int, int]],
+        progress: RenderProgress,
+        serve_url: str | None,
+        render_settings: dict | None = None,
+        workers: int = 0,
+        chunk_dir: str | None = None,
+        only: list[int] | None = None,
+    ) -> str | dict:
+        """
+        Render frame ranges (muted), at most `workers` at once, then concat
+        them (stream copy) and mux the narration from disk once. A short reel
+        can be a single range covering the whole composition.
 
-        print(f"[REMOTION] AUDIO URL = {audio_url}")
+        With chunk_dir the chunks are kept there with a CHUNK_MANIFEST, and
+        `only` renders just those chunk indices - the others are reused
+        as-is. progress has one weight per rendered chunk.
+        """
+        todo = list(range(len(chunks))) if only is None else sorted(only)
+        if len(chunks) > 1:
+            print(f"[REMOTION] Chunked render: {len(todo)} of {len(chunks)} chunks {[chunks[i] for i in todo]}")
+        limit = asyncio.Semaphore(workers or len(todo) or 1)
 
-        # ----------------------------
-        # 2. Write props to JSON FILE
-        # ----------------------------
-        props = {
-            "text": text,
-            "audioSrc": audio_url,
-            "scenes": scenes,
-            "durationInFrames": duration_in_frames,
-        }
+        with job_workspace(os.path.basename(os.path.dirname(output_path))) as workspace:
+            if chunk_dir:
+                os.makedirs(chunk_dir, exist_ok=True)
+                # Stale until every chunk matches these props again
+                clear_chunk_manifest(chunk_dir)
+            chunk_paths = [os.path.join(chunk_dir or workspace, f"chunk_{i}.mp4") for i in range(len(chunks))]
+
+            async def render_chunk(n: int, i: int) -> str | dict:
+                staged_path = os.path.join(workspace, f"render_{i}.mp4")
+                async with limit:
+                    result = await self._render_range(
+                        template_id,
+                        staged_path,
+                        props,
+                        props_path,
+                        duration_in_frames,
+                        frame_range=chunks[i],
+                        on_progress=progress.reporter(n),
+                        serve_url=serve_url,
+                        render_settings=render_settings,
+                    )
+                if not isinstance(result, dict):
+                    await asyncio.to_thread(publish, staged_path, chunk_paths[i])
+                return result
+
+            results = await asyncio.gather(*(render_chunk(n, i) for n, i in enumerate(todo)))
+
+            for i, result in zip(todo, results):
+                if isinstance(result, dict):
+                    if len(chunks) == 1:
+                        return result
+                    return {"error": f"Chunk {chunks[i][0]}-{chunks[i][1]} failed: {result['error']}"}
+
+            list_path = os.path.join(workspace, "chunks.txt")
+            write_concat_list(chunk_paths, list_path)
+
+            staged_path = os.path.join(workspace, "final.mp4")
+            duration_s = duration_in_frames / RENDER_FPS
+            await asyncio.to_thread(run_ffmpeg, [
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-i", audio_abs,
+                "-map", "0:v", "-map", "1:a",
+                "-c:v", "copy", "-c:a", "aac", "-ar", "48000",
+                # Pad/trim the narration to the composition's length
+                "-af", f"apad=whole_dur={duration_s:.3f}", "-t", f"{duration_s:.3f}",
+                "-movflags", "+faststart",
+                staged_path,
+            ])
+            await asyncio.to_thread(publish, staged_path, output_path)
 
-        props_path = os.path.join(
-            os.path.dirname(output_path),
-            "remotion_props.json",
-        )
+        if chunk_dir:
+            with open(os.path.join(chunk_dir, CHUNK_MANIFEST), "w", encoding="utf-8") as f:
+                json.dump({
+                    "template": template_id,
+                    "durationInFrames": duration_in_frames,
+                    "chunks": chunks,
+                    "renderSettings": render_settings,
+                }, f)
 
-        with open(props_path, "w", encoding="utf-8") as f:
-            json.dump(props, f, ensure_ascii=False)
+        print(f"[REMOTION] ✓ Render Success: {output_path}")
+        return output_path
 
-        print(f"[REMOTION] PROPS FILE = {props_path}")
-        print(f"[REMOTION] DURATION_IN_FRAMES = {duration_in_frames}")
+    async def _render_range(
+        self,
+        template_id: str,
+        output_path: str,
+        props: dict,
+        props_path: str,
+        duration_in_frames: int,
+        frame_range: tuple[int, int] | None = None,
+        on_progress=None,
+        serve_url: str | None = None,
+        render_settings: dict | None = None,
+    ) -> str | dict:
+        """Render one frame range of the composition, muted - sidecar first, npx fallback."""
+        from core.config import settings
+
+        # Production timeout: 10 minutes max
+        RENDER_TIMEOUT = int(os.environ.get("RENDER_TIMEOUT", "600"))
 
         # ----------------------------
-        # 3. Build command
+        # Persistent render server (warm bundle + browser)
+        # ----------------------------
+        if settings.REMOTION_RENDER_SERVER:
+            try:
+                print("[REMOTION] Rendering on persistent render server...")
+                result = await get_render_server(self.frontend_dir).render(
+                    template_id,
+                    output_path,
+                    props,
+                    duration_in_frames=duration_in_frames,
+                    timeout=RENDER_TIMEOUT,
+                    on_progress=on_progress,
+                    frame_range=frame_range,
+                    serve_url=serve_url,
+                    render_settings=render_settings,
+                )
+                if isinstance(result, dict):
+                    print(f"[REMOTION ERROR] {result['error'][:1000]}")
+                else:
+                    print(f"[REMOTION] ✓ Render Success: {output_path}")
+                return result
+            except RenderServerError as e:
+                print(f"[REMOTION] Render server unavailable ({e}), falling back to npx")
+
+        # ----------------------------
+        # Build command
         # ----------------------------
         npx_cmd = "npx.cmd" if os.name == "nt" else "npx"
 
-        # Use pre-built bundle if available (Docker/Production)
-        bundle_path = os.path.join(self.frontend_dir, "dist-bundle")
-        if os.path.exists(bundle_path) and os.path.isdir(bundle_path):
-            print(f"[REMOTION] Using Pre-built Bundle: {bundle_path}")
-            entry_point = "dist-bundle"
+        # Use the cached/pre-built bundle if available (see services.remotion_bundle)
+        if serve_url:
+            print(f"[REMOTION] Using Pre-built Bundle: {serve_url}")
+            entry_point = serve_url
         else:
             print("[REMOTION] Using Source (Runtime Bundling)")
             entry_point = "src/remotion/index.ts"
@@ -108,76 +576,51 @@ class RemotionRenderer:
             f"--duration-in-frames={duration_in_frames}",
             "--log=verbose",
         ]
+        if frame_range:
+            cmd += [f"--frames={frame_range[0]}-{frame_range[1]}", "--muted"]
+        if render_settings:
+            cmd += cli_render_flags(render_settings)
 
         print("[REMOTION] Command:", " ".join(cmd))
         print(f"[REMOTION] CWD: {self.frontend_dir}")
 
         # ----------------------------
-        # 4. Execute with timeout & capture
+        # Execute with timeout & capture
         # ----------------------------
-        # Production timeout: 10 minutes max
-        RENDER_TIMEOUT = int(os.environ.get("RENDER_TIMEOUT", "600"))
-        
         print(f"[REMOTION] Starting render (timeout: {RENDER_TIMEOUT}s)...")
 
         try:
-            # Run subprocess with output capture
-            def run_subprocess():
-                return subprocess.run(
-                    cmd,
-                    cwd=self.frontend_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=RENDER_TIMEOUT,
-                )
-
-            result = await asyncio.wait_for(
-                asyncio.to_thread(run_subprocess),
-                timeout=RENDER_TIMEOUT + 30  # Extra buffer for asyncio
+            # Stream output (progress -> job logs), keep only the tail for errors
+            returncode, tail = await run_streaming(
+                cmd,
+                cwd=self.frontend_dir,
+                timeout=RENDER_TIMEOUT,
+                on_line=cli_progress_parser(on_progress) if on_progress else None,
             )
 
             # Check return code
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"[REMOTION] ✓ Render Success: {output_path}")
-                # Log last 500 chars of stdout for debugging
-                if result.stdout:
-                    print(f"[REMOTION] STDOUT (last 500):\n{result.stdout[-500:]}")
+                # Log last lines of output for debugging
+                if tail:
+                    print("[REMOTION] OUTPUT (last 10 lines):\n" + "\n".join(tail[-10:]))
                 return output_path
             else:
                 # Non-zero return code - capture the error
-                error_details = result.stderr or result.stdout or "No output captured"
-                # Truncate for logging but keep enough for diagnosis
-                error_truncated = error_details[:1000] if len(error_details) > 1000 else error_details
-                
-                error_msg = f"Remotion exited with code {result.returncode}"
+                error_details = "\n".join(tail) or "No output captured"
+                # Truncate for logging but keep enough for diagnosis (the end holds the error)
+                error_truncated = error_details[-1000:]
+
+                error_msg = f"Remotion exited with code {returncode}"
                 print(f"[REMOTION ERROR] {error_msg}")
-                print(f"[REMOTION STDERR]:\n{error_truncated}")
-                
+                print(f"[REMOTION OUTPUT]:\n{error_truncated}")
+
                 return {"error": f"{error_msg}: {error_truncated}"}
 
-        except subprocess.TimeoutExpired as e:
+        except ProcessTimeout as e:
             error_msg = f"Render timeout after {RENDER_TIMEOUT}s (low CPU environment?)"
             print(f"[REMOTION ERROR] {error_msg}")
-            # Try to capture any partial output
-            if hasattr(e, 'stdout') and e.stdout:
-                print(f"[REMOTION PARTIAL STDOUT]: {e.stdout[:500]}")
-            if hasattr(e, 'stderr') and e.stderr:
-                print(f"[REMOTION PARTIAL STDERR]: {e.stderr[:500]}")
+            # Partial output before the process tree was killed
+            if e.tail:
+                print("[REMOTION PARTIAL OUTPUT]:\n" + "\n".join(e.tail[-10:]))
             return {"error": error_msg}
-
-        except asyncio.TimeoutError:
-            error_msg = f"Async timeout after {RENDER_TIMEOUT + 30}s - render hung"
-            print(f"[REMOTION ERROR] {error_msg}")
-            return {"error": error_msg}
-
-        except Exception as e:
-            error_msg = f"Unexpected error: {type(e).__name__}: {str(e)}"
-            print(f"[REMOTION ERROR] {error_msg}")
-            import traceback
-            traceback.print_exc()
-            return {"error": error_msg}
-        
-        finally:
-            print("=" * 60)
-            print("REMOTION RENDER END")
-            print("=" * 60 + "\n")
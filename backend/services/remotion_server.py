@@ -0,0 +1,244 @@
+# Remotion Render Server Client for ReelAgent
+# Keeps one long-lived Node sidecar (frontend/render-server.mjs) per frontend
+# directory and sends it render requests as newline-delimited JSON.
+#
+# The sidecar holds the Remotion bundle and a headless browser warm, so a
+# render no longer pays npx resolution + Node startup + bundling + browser
+# launch. If the sidecar can't start or dies mid-render, callers get a
+# RenderServerError and fall back to the `npx remotion render` subprocess.
+# A render that times out or whose caller is cancelled is cancelled on the
+# sidecar alone; other renders keep running unless the sidecar stops answering.
+
+import asyncio
+import itertools
+import json
+import os
+from typing import Callable, Optional
+
+SIDECAR_SCRIPT = "render-server.mjs"
+
+# Startup bundles the project when no bundle is passed in - allow for that
+STARTUP_TIMEOUT = 300
+
+# Protocol lines can carry long error stacks
+STREAM_LIMIT = 4 * 1024 * 1024
+
+# Seconds a cancelled render gets to answer before the sidecar counts as hung
+CANCEL_GRACE = 30
+
+
+class RenderServerError(Exception):
+    """The sidecar itself is unavailable (not a failed render)."""
+
+
+class RemotionRenderServer:
+    def __init__(self, frontend_dir: str):
+        self.frontend_dir = os.path.abspath(frontend_dir)
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self._progress: dict[str, Callable[[float], None]] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def running(self) -> bool:
+        # The reader stops at EOF, possibly before the exit status is reaped
+        return (
+            self._process is not None
+            and self._process.returncode is None
+            and self._reader is not None
+            and not self._reader.done()
+        )
+
+    async def start(self, serve_url: Optional[str] = None):
+        """
+        Start the sidecar if it isn't running; returns once it reports ready.
+        serve_url is its default bundle (see services.remotion_bundle).
+        """
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.running:
+                return
+            await self._kill()  # Reap a sidecar that died
+            script = os.path.join(self.frontend_dir, SIDECAR_SCRIPT)
+            if not os.path.exists(script):
+                raise RenderServerError(f"{script} not found")
+
+            node = "node.exe" if os.name == "nt" else "node"
+            print(f"[REMOTION SERVER] Starting sidecar: {node} {SIDECAR_SCRIPT}")
+            try:
+                env = dict(os.environ)
+                if serve_url:
+                    env["REMOTION_SERVE_URL"] = serve_url
+                self._process = await asyncio.create_subprocess_exec(
+                    node, SIDECAR_SCRIPT,
+                    cwd=self.frontend_dir,
+                    env=env,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=None,  # Remotion logs go straight to our stderr
+                    limit=STREAM_LIMIT,
+                )
+            except OSError as e:
+                raise RenderServerError(f"Could not start node: {e}")
+
+            try:
+                ready = await asyncio.wait_for(self._read_message(), timeout=STARTUP_TIMEOUT)
+            except Exception as e:
+                await self._kill()
+                raise RenderServerError(f"Sidecar did not become ready: {e}")
+            if not ready or ready.get("type") != "ready":
+                await self._kill()
+                raise RenderServerError(f"Sidecar startup failed: {ready}")
+
+            print(f"[REMOTION SERVER] Ready (serveUrl: {ready.get('serveUrl')})")
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def _read_message(self) -> Optional[dict]:
+        """Next protocol message, or None at EOF. Non-JSON lines are logged and skipped."""
+        while True:
+            line = await self._process.stdout.readline()
+            if not line:
+                return None
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[REMOTION SERVER] {line.decode(errors='replace').rstrip()}")
+
+    async def _read_loop(self):
+        try:
+            while True:
+                message = await self._read_message()
+                if message is None:
+                    break
+                request_id = message.get("id")
+                kind = message.get("type")
+                if kind == "progress":
+                    callback = self._progress.get(request_id)
+                    if callback:
+                        callback(message.get("progress", 0.0))
+                    continue
+                future = self._pending.get(request_id)
+                if future and not future.done():
+                    future.set_result(message)
+        finally:
+            # Sidecar exited - fail everything still waiting on it
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(RenderServerError("Render sidecar exited"))
+
+    async def _kill(self):
+        if self._process and self._process.returncode is None:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+            await self._process.wait()
+
+    async def render(
+        self,
+        composition: str,
+        output_path: str,
+        input_props: dict,
+        duration_in_frames: Optional[int] = None,
+        timeout: float = 600,
+        on_progress: Optional[Callable[[float], None]] = None,
+        frame_range: Optional[tuple[int, int]] = None,
+        serve_url: Optional[str] = None,
+        render_settings: Optional[dict] = None,
+    ) -> str | dict:
+        """
+        Render one composition on the sidecar. With frame_range (inclusive)
+        only those frames are rendered, without audio. Several renders may
+        run on the sidecar at once. serve_url picks the bundle per request;
+        render_settings (concurrency, imageFormat, jpegQuality, x264Preset)
+        are passed to renderMedia.
+
+        Returns the output path, or {"error": ...} if Remotion failed the
+        render or timed out (a hung sidecar is killed and restarted on the
+        next call). Raises RenderServerError if the sidecar is unavailable.
+        """
+        await self.start(serve_url)
+
+        request_id = str(next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        if on_progress:
+            self._progress[request_id] = on_progress
+
+        request = {
+            "id": request_id,
+            "type": "render",
+            "composition": composition,
+            "outputPath": os.path.abspath(output_path),
+            "inputProps": input_props,
+            "durationInFrames": duration_in_frames,
+            "frameRange": list(frame_range) if frame_range else None,
+            "serveUrl": serve_url,
+            "renderSettings": render_settings,
+        }
+        try:
+            self._process.stdin.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            await self._process.stdin.drain()
+            message = await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._send_cancel(request_id)
+            try:
+                await asyncio.wait_for(future, timeout=CANCEL_GRACE)
+            except asyncio.TimeoutError:
+                # Not even the cancel was answered - the sidecar is hung
+                await self._kill()
+            except RenderServerError:
+                pass
+            return {"error": f"Render timeout after {timeout}s (low CPU environment?)"}
+        except asyncio.CancelledError:
+            # Stop the render in Node too, without waiting for it
+            self._send_cancel(request_id)
+            future.cancel()
+            raise
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise RenderServerError(f"Render sidecar pipe closed: {e}")
+        finally:
+            self._pending.pop(request_id, None)
+            self._progress.pop(request_id, None)
+
+        if message.get("type") == "done":
+            return message.get("outputPath", output_path)
+        return {"error": message.get("error", "Unknown render error")}
+
+    def _send_cancel(self, request_id: str):
+        if not self.running:
+            return
+        try:
+            self._process.stdin.write(json.dumps({"type": "cancel", "id": request_id}).encode("utf-8") + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    async def close(self):
+        if not self.running:
+            return
+        try:
+            self._process.stdin.write(b'{"type": "shutdown"}\n')
+            await self._process.stdin.drain()
+            await asyncio.wait_for(self._process.wait(), timeout=30)
+        except Exception:
+            await self._kill()
+
+
+_servers: dict[str, RemotionRenderServer] = {}
+
+
+def get_render_server(frontend_dir: str) -> RemotionRenderServer:
+    """Shared sidecar client for a frontend directory."""
+    key = os.path.abspath(frontend_dir)
+    server = _servers.get(key)
+    if server is None:
+        server = _servers[key] = RemotionRenderServer(key)
+    return server
+
+
+async def close_render_servers():
+    for server in list(_servers.values()):
+        await server.close()
@@ -0,0 +1,77 @@
+# Render Cache for ReelAgent
+# Content-addressed store of finished Remotion renders.
+#
+# The key hashes the props file the render was made from (scenes, timings,
+# text), the template, the Remotion source version (services.remotion_bundle)
+# and the narration audio bytes - the props carry no audio path since the
+# narration is muxed from disk. A hit is hardlinked into the new job dir
+# (copied across filesystems), so a repeated render costs no disk space.
+# Entries live under DATA_DIR/render_cache (services.file_store); the least
+# recently used are evicted once RENDER_CACHE_MAX_MB is exceeded.
+
+import hashlib
+import os
+import shutil
+from typing import Optional
+
+from core.config import settings
+from services.file_store import LRUFileStore
+from services.remotion_bundle import source_hash
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RenderCache(LRUFileStore):
+    def _place(self, src: str, dst: str):
+        # Hardlink both ways, copy across filesystems
+        tmp_path = dst + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+
+    # ----------------------------
+    # Keys
+    # ----------------------------
+    @staticmethod
+    def make_key(template_id: str, props_path: str, audio_path: str, frontend_dir: str, variant: str = "") -> str:
+        """Blocking: hashes the props file, the audio and the template sources. variant: e.g. "preview"."""
+        with open(props_path, "rb") as f:
+            props_digest = hashlib.sha256(f.read()).hexdigest()
+        raw = "|".join([
+            template_id,
+            props_digest,
+            _file_digest(audio_path),
+            source_hash(frontend_dir),
+            variant,
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ----------------------------
+    # Public API (blocking - call via asyncio.to_thread)
+    # ----------------------------
+    def lookup(self, key: str, output_path: str) -> Optional[str]:
+        """Link a cached render for this key to output_path; None on a miss."""
+        result = self._get(key, output_path)
+        if result:
+            print(f"✓ Render cache hit: {output_path}")
+        return result
+
+    def store(self, key: str, video_path: str):
+        """Add a finished render to the cache, evicting LRU entries if needed."""
+        self._put(key, video_path, f"{key}.mp4")
+
+
+render_cache = RenderCache(
+    cache_dir=os.path.join(settings.DATA_DIR, "render_cache"),
+    max_bytes=settings.RENDER_CACHE_MAX_MB * 1024 * 1024,
+)
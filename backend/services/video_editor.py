@@ -1,5 +1,9 @@
 from moviepy.editor import ImageClip, AudioFileClip, concatenate_videoclips, CompositeVideoClip, TextClip
 from models import Scene, JobDB
+from services.audio_probe import get_audio_duration
+from services.ffmpeg_assembler import assemble_reel_ffmpeg
+from services.workspace import job_workspace
+from core.config import settings
 import os
 
 def create_video_clip(scene: Scene, output_dir: str, index: int, job_id: str = None) -> str:
@@ -9,7 +13,8 @@ def create_video_clip(scene: Scene, output_dir: str, index: int, job_id: str = N
     try:
         if job_id: JobDB.add_log(job_id, f"   - Assembly Scene {index}: Loading audio {scene.audio_path}...")
         audio = AudioFileClip(scene.audio_path)
-        duration = audio.duration + 0.5 # Add padding
+        # Header-exact duration; moviepy's ffmpeg-reported value is a bitrate estimate for MP3
+        duration = (get_audio_duration(scene.audio_path) or audio.duration) + 0.5 # Add padding
         
         if job_id: JobDB.add_log(job_id, f"   - Assembly Scene {index}: Loading image {scene.image_path}...")
         # Load Image
@@ -17,6 +22,7 @@ def create_video_clip(scene: Scene, output_dir: str, index: int, job_id: str = N
         
         # Simple Zoom Effect (Resize) - DISABLED due to Memory Usage (int64 allocation errors)
         # img_clip = img_clip.resize(lambda t: 1 + 0.05 * t) 
+        # Motion is provided by the ffmpeg engine instead (ffmpeg_assembler.motion_filter)
         
         # Set Audio
         video_clip = img_clip.set_audio(audio)
@@ -28,9 +34,54 @@ def create_video_clip(scene: Scene, output_dir: str, index: int, job_id: str = N
         if job_id: JobDB.add_log(job_id, f"ERROR: {msg}")
         return None
 
+def segment_dir_for(output_path: str) -> str:
+    """Encoded scene segments are kept next to the reel for incremental re-assembly."""
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), "segments")
+
 def assemble_reel(scenes: list[Scene], output_path: str, job_id: str = None):
     """
     Concatenates all scene clips into a final video.
+    
+    Uses the ffmpeg engine (services.ffmpeg_assembler) unless VIDEO_ENGINE is
+    "moviepy"; falls back to moviepy if ffmpeg is unavailable or fails.
+    Temp files live in a private per-call workspace (services.workspace), so
+    concurrent assemblies never share scratch files; the ffmpeg engine keeps
+    its scene segments in segment_dir_for(output_path) and reuses unchanged
+    ones the next time the same reel is assembled.
+    """
+    with job_workspace(job_id) as workspace:
+        if settings.VIDEO_ENGINE == "ffmpeg":
+            try:
+                if job_id: JobDB.add_log(job_id, f"Starting ffmpeg assembly of {len(scenes)} scenes...")
+                return assemble_reel_ffmpeg(
+                    scenes, output_path, workspace, job_id, segment_dir=segment_dir_for(output_path)
+                )
+            except Exception as e:
+                msg = f"ffmpeg assembly failed ({e}), falling back to moviepy"
+                print(msg)
+                if job_id: JobDB.add_log(job_id, msg)
+        
+        return assemble_reel_moviepy(scenes, output_path, workspace, job_id)
+
+def assemble_preview(scenes: list[Scene], output_path: str, job_id: str = None) -> bool:
+    """
+    Quick low-resolution preview of the reel (ffmpeg engine, no motion), made
+    before the full assembly. Best effort: returns False instead of raising.
+    """
+    with job_workspace(job_id) as workspace:
+        try:
+            return assemble_reel_ffmpeg(
+                scenes, output_path, workspace, preview=True, segment_dir=segment_dir_for(output_path)
+            )
+        except Exception as e:
+            msg = f"Preview assembly failed: {e}"
+            print(msg)
+            if job_id: JobDB.add_log(job_id, msg)
+            return False
+
+def assemble_reel_moviepy(scenes: list[Scene], output_path: str, workspace: str, job_id: str = None):
+    """
+    Concatenates all scene clips into a final video with moviepy (frame by frame in Python).
     """
     clips = []
     try:
@@ -54,6 +105,7 @@ def assemble_reel(scenes: list[Scene], output_path: str, job_id: str = None):
         if job_id: JobDB.add_log(job_id, f"Writing video file to {output_path}...")
         # Optimize write for low memory usage: threads=1, reduced FPS if needed (kept 24 for now)
         # Added temp_audiofile to fix Windows "Broken pipe" / permission errors with FFMPEG
+        # (kept in the job workspace - a fixed name in the CWD clashed between concurrent jobs)
         final_video.write_videofile(
             output_path, 
             fps=24, 
@@ -61,7 +113,7 @@ def assemble_reel(scenes: list[Scene], output_path: str, job_id: str = None):
             audio_codec="aac",
             threads=1,            # Lower memory usage
             preset="ultrafast",   # Faster encoding
-            temp_audiofile="temp-audio.m4a", 
+            temp_audiofile=os.path.join(workspace, "temp-audio.m4a"), 
             remove_temp=True
         )
         
@@ -0,0 +1,56 @@
+# Job Workspace for ReelAgent
+# Private scratch directory per assembly, removed when the assembly ends.
+#
+# Temp files (segments, concat lists, moviepy's temp audio) used to live in
+# the process CWD or the job folder under fixed names, so two concurrent
+# assemblies could overwrite each other's files. Each assembly now gets its
+# own directory. With VIDEO_TMPFS it goes on /dev/shm (RAM-backed) when
+# enough memory is free, which takes the temp I/O off the disk.
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import psutil
+
+from core.config import settings
+
+TMPFS_DIR = "/dev/shm"
+
+# Keep this much RAM free beyond the workspace itself before using tmpfs
+TMPFS_HEADROOM_MB = 512
+
+
+def _tmpfs_has_room(needed_mb: int) -> bool:
+    if not os.path.isdir(TMPFS_DIR) or not os.access(TMPFS_DIR, os.W_OK):
+        return False
+    try:
+        free_shm = shutil.disk_usage(TMPFS_DIR).free
+        available = psutil.virtual_memory().available
+    except Exception:
+        return False
+    needed = needed_mb * 1024 * 1024
+    return free_shm > needed and available > needed + TMPFS_HEADROOM_MB * 1024 * 1024
+
+
+def workspace_root(needed_mb: Optional[int] = None) -> str:
+    """Directory new workspaces are created in (tmpfs if enabled and roomy enough)."""
+    needed_mb = needed_mb or settings.VIDEO_TMPFS_MIN_MB
+    if settings.VIDEO_TMPFS and _tmpfs_has_room(needed_mb):
+        return TMPFS_DIR
+    return tempfile.gettempdir()
+
+
+@contextmanager
+def job_workspace(job_id: Optional[str] = None, needed_mb: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield a fresh scratch directory for one job; always removed on exit,
+    including on errors.
+    """
+    path = tempfile.mkdtemp(prefix=f"reel_{job_id or 'job'}_", dir=workspace_root(needed_mb))
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.getcwd())
+
+import pytest
+
+from services.audio_probe import get_audio_duration
+from services.ffmpeg_assembler import get_ffmpeg_binary
+
+FFMPEG = get_ffmpeg_binary()
+TOLERANCE = 0.001  # seconds
+
+# (name, ffmpeg output args) - all encode the same 3.3s sine
+CASES = [
+    ("cbr_44k.mp3", ["-ar", "44100", "-c:a", "libmp3lame", "-b:a", "128k"]),
+    ("vbr_44k.mp3", ["-ar", "44100", "-c:a", "libmp3lame", "-q:a", "4"]),
+    ("cbr_24k_mono.mp3", ["-ar", "24000", "-ac", "1", "-c:a", "libmp3lame", "-b:a", "64k"]),
+    ("pcm_22k.wav", ["-ar", "22050", "-c:a", "pcm_s16le"]),
+]
+
+
+def make_audio(path: str, args: list[str], seconds: float = 3.3):
+    subprocess.run(
+        [FFMPEG, "-loglevel", "error", "-y", "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}", *args, path],
+        check=True,
+    )
+
+
+def decoded_duration(path: str) -> float:
+    """Reference: samples ffmpeg actually decodes (gapless trimming applied), at 48kHz mono s32."""
+    pcm = subprocess.run(
+        [FFMPEG, "-loglevel", "error", "-i", path, "-ac", "1", "-ar", "48000", "-f", "s32le", "-"],
+        check=True,
+        capture_output=True,
+    ).stdout
+    return len(pcm) / 4 / 48000
+
+
+@pytest.fixture(scope="module")
+def audio_dir():
+    if not FFMPEG:
+        pytest.skip("ffmpeg not available")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, args in CASES:
+            make_audio(os.path.join(tmp, name), args)
+        yield tmp
+
+
+@pytest.mark.parametrize("name", [name for name, _ in CASES])
+def test_matches_decoded_duration(audio_dir, name):
+    path = os.path.join(audio_dir, name)
+    assert get_audio_duration(path) == pytest.approx(decoded_duration(path), abs=TOLERANCE)
+
+
+def test_lame_delay_and_padding_subtracted(audio_dir):
+    assert get_audio_duration(os.path.join(audio_dir, "cbr_44k.mp3")) == pytest.approx(3.3, abs=TOLERANCE)
+
+
+def test_concatenated_streams(audio_dir):
+    # gTTS joins whole MP3 responses back to back - each keeps its own tag
+    with open(os.path.join(audio_dir, "cbr_24k_mono.mp3"), "rb") as f:
+        part = f.read()
+    joined = os.path.join(audio_dir, "joined.mp3")
+    with open(joined, "wb") as f:
+        f.write(part + part)
+    assert get_audio_duration(joined) == pytest.approx(6.6, abs=TOLERANCE)
+
+
+def test_unrecognised_file(audio_dir):
+    path = os.path.join(audio_dir, "noise.bin")
+    with open(path, "wb") as f:
+        f.write(b"not audio at all" * 100)
+    assert get_audio_duration(path) is None
+    assert get_audio_duration(os.path.join(audio_dir, "missing.mp3")) is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -29,7 +29,7 @@ async def test_audio():
     except Exception as e:
         print(f"[FAIL] Audio Service failed: {e}")
 
-def test_image():
+async def test_image():
     print("\n--- Testing Image Service (All Providers) ---")
     output = "test_image.jpg"
     if os.path.exists(output):
@@ -37,7 +37,7 @@ def test_image():
         
     try:
         # This uses the main function with fallbacks
-        result = generate_image("A futuristic city, cinematic lighting, high detail", output)
+        result = await generate_image("A futuristic city, cinematic lighting, high detail", output)
         
         if result and os.path.exists(result):
              print(f"[OK] Image SUCCESS: {result}")
@@ -48,4 +48,4 @@ def test_image():
 
 if __name__ == "__main__":
     asyncio.run(test_audio())
-    test_image()
+    asyncio.run(test_image())
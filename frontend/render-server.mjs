@@ -0,0 +1,188 @@
+// Remotion render sidecar for ReelAgent.
+//
+// Long-lived Node process driven by the backend (services/remotion_server.py)
+// over newline-delimited JSON on stdin/stdout. The bundle is built (or the
+// pre-built one loaded) once and one headless browser is kept open,
+// so each render skips npx resolution, Node startup, bundling and the
+// browser launch that `npx remotion render` pays every time.
+//
+// Requests (stdin, one JSON object per line):
+//   {"id": "1", "type": "render", "composition": "Bauhaus", "outputPath": "/abs/out.mp4",
+//    "inputProps": {...}, "durationInFrames": 450, "frameRange": [0, 224] | null,
+//    "serveUrl": "/abs/.bundle-cache/<hash>" | null,
+//    "renderSettings": {"concurrency": 2, "imageFormat": "jpeg", "jpegQuality": 80,
+//                       "x264Preset": "faster", "scale": 0.33 (previews)} | null}
+//   (a frameRange render is muted - used for parallel chunks; serveUrl overrides
+//   the startup bundle so a rebuilt bundle needs no sidecar restart)
+//   {"type": "cancel", "id": "1"}   (aborts that render; it answers with an error)
+//   {"type": "shutdown"}
+// Responses (stdout, one JSON object per line):
+//   {"type": "ready", "serveUrl": "..."}
+//   {"id": "1", "type": "progress", "progress": 0.42}
+//   {"id": "1", "type": "done", "outputPath": "/abs/out.mp4"}
+//   {"id": "1", "type": "error", "error": "..."}
+// Everything else (Remotion logs) goes to stderr.
+
+import path from "node:path";
+import readline from "node:readline";
+import { fileURLToPath } from "node:url";
+
+import { bundle } from "@remotion/bundler";
+import { makeCancelSignal, openBrowser, renderMedia, selectComposition } from "@remotion/renderer";
+
+const rootDir = path.dirname(fileURLToPath(import.meta.url));
+
+// stdout is reserved for the protocol
+console.log = (...args) => console.error(...args);
+console.info = (...args) => console.error(...args);
+
+const send = (message) => process.stdout.write(JSON.stringify(message) + "\n");
+
+async function resolveServeUrl() {
+    // Bundle from the backend's cache (services/remotion_bundle.py)
+    if (process.env.REMOTION_SERVE_URL) {
+        console.error(`[render-server] Using bundle: ${process.env.REMOTION_SERVE_URL}`);
+        return process.env.REMOTION_SERVE_URL;
+    }
+    // (dist-bundle is passed in above when its source hash is current - it
+    // may be stale, so it is never picked up here on its own)
+    console.error("[render-server] Bundling src/remotion/index.ts...");
+    return bundle({ entryPoint: path.join(rootDir, "src/remotion/index.ts") });
+}
+
+let browser = null;
+
+// Cancel functions of the renders in flight, by request id
+const cancels = new Map();
+
+async function getBrowser() {
+    if (!browser) {
+        browser = await openBrowser("chrome", {
+            browserExecutable: process.env.REMOTION_BROWSER_EXECUTABLE || null,
+        });
+    }
+    return browser;
+}
+
+async function resetBrowser() {
+    const old = browser;
+    browser = null;
+    if (old) {
+        await old.close({ silent: true }).catch(() => {});
+    }
+}
+
+async function render(serveUrl, request, cancelState) {
+    const { id, composition: compositionId, outputPath, inputProps = {}, durationInFrames, frameRange } = request;
+    const { concurrency = null, imageFormat, jpegQuality, x264Preset, scale = 1 } = request.renderSettings || {};
+    const puppeteerInstance = await getBrowser();
+
+    const selected = await selectComposition({
+        serveUrl,
+        id: compositionId,
+        inputProps,
+        puppeteerInstance,
+    });
+    // Same as the CLI's --duration-in-frames override
+    const composition = durationInFrames ? { ...selected, durationInFrames } : selected;
+
+    // A cancel that arrived before renderMedia started never reaches its signal
+    if (cancelState.cancelled) {
+        throw new Error("Render cancelled");
+    }
+
+    let lastReported = -1;
+    await renderMedia({
+        composition,
+        serveUrl,
+        codec: "h264",
+        outputLocation: outputPath,
+        inputProps,
+        puppeteerInstance,
+        frameRange: frameRange || null,
+        muted: Boolean(frameRange),
+        concurrency,
+        imageFormat,
+        jpegQuality,
+        x264Preset,
+        scale,
+        cancelSignal: cancelState.cancelSignal,
+        onProgress: ({ progress }) => {
+            // Whole percents only - keeps the pipe quiet
+            const percent = Math.floor(progress * 100);
+            if (percent !== lastReported) {
+                lastReported = percent;
+                send({ id, type: "progress", progress: percent / 100 });
+            }
+        },
+    });
+    return outputPath;
+}
+
+async function main() {
+    const serveUrl = await resolveServeUrl();
+    await getBrowser();
+    send({ type: "ready", serveUrl });
+
+    // Renders run concurrently (e.g. chunks of one reel) on the shared browser
+    const inflight = new Set();
+
+    const lines = readline.createInterface({ input: process.stdin });
+    lines.on("line", (line) => {
+        if (!line.trim()) return;
+
+        let request;
+        try {
+            request = JSON.parse(line);
+        } catch (err) {
+            console.error(`[render-server] Bad request line: ${line.slice(0, 200)}`);
+            return;
+        }
+
+        if (request.type === "shutdown") {
+            lines.close();
+            return;
+        }
+
+        if (request.type === "cancel") {
+            const cancel = cancels.get(request.id);
+            if (cancel) cancel();
+            return;
+        }
+
+        const { cancelSignal, cancel } = makeCancelSignal();
+        const cancelState = { cancelSignal, cancelled: false };
+        cancels.set(request.id, () => {
+            cancelState.cancelled = true;
+            cancel();
+        });
+
+        const task = (async () => {
+            try {
+                const outputPath = await render(request.serveUrl || serveUrl, request, cancelState);
+                send({ id: request.id, type: "done", outputPath });
+            } catch (err) {
+                send({ id: request.id, type: "error", error: String(err && err.stack ? err.stack : err) });
+                // A crashed page can poison the browser - start fresh once nothing else uses it
+                if (!cancelState.cancelled && inflight.size === 1) {
+                    await resetBrowser();
+                }
+            } finally {
+                cancels.delete(request.id);
+            }
+        })();
+        inflight.add(task);
+        task.finally(() => inflight.delete(task));
+    });
+
+    lines.on("close", async () => {
+        await Promise.all(inflight);
+        await resetBrowser();
+        process.exit(0);
+    });
+}
+
+main().catch((err) => {
+    console.error(`[render-server] Startup failed: ${err && err.stack ? err.stack : err}`);
+    process.exit(1);
+});